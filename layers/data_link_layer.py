@@ -3,9 +3,13 @@ Capa de enlace simplificada - coordinador de eventos.
 Solo timing y comunicación entre capas.
 """
 
-from models.frame import Frame
+import logging
+
+from models.frame import Frame, FrameType
 from models.events import Event, EventType
 
+log = logging.getLogger(__name__)
+
 
 class DataLinkLayer:
     """Capa de enlace simplificada - coordinador de eventos."""
@@ -14,133 +18,136 @@ class DataLinkLayer:
         """Inicializa la capa de enlace."""
         self.machine_id = machine_id
         self.protocol = protocol
+        self._peer_id = self._get_other_machine_id()  # Destino de los ACKs
+
+        # Métodos del protocolo resueltos una sola vez al enlazarlo
+        self._on_frame_arrival = protocol.handle_frame_arrival
+        self._on_frame_corruption = protocol.handle_frame_corruption
+        self._on_network_layer_ready = protocol.handle_network_layer_ready
+
+        # Frames de control por (tipo, número): su contenido no cambia y la capa
+        # física transmite siempre una copia, así que se crean una sola vez
+        self._control_frames = {}
 
     def send_frame(self, frame: Frame, destination_id: str, physical_layer, simulator) -> None:
         """Envía un frame directamente al physical layer (sin delay adicional)."""
-        print(f"  [DataLink-{self.machine_id}] Enviando {frame} al physical layer")
+        log.debug("  [DataLink-%s] Enviando %s al physical layer", self.machine_id, frame)
         physical_layer.send_frame(frame, destination_id, simulator)
 
 
     def handle_frame_arrival(self, frame: Frame, simulator) -> None:
         """Coordina llegada de frame con protocolo."""
-        print(f"  [DataLink-{self.machine_id}] Frame recibido: {frame}")
+        log.debug("  [DataLink-%s] Frame recibido: %s", self.machine_id, frame)
 
         # DataLinkLayer verifica checksum (como en la realidad)
         if self._verify_frame_checksum(frame):
             # Frame válido - protocolo decide qué hacer
-            response = self.protocol.handle_frame_arrival(frame)
+            response = self._on_frame_arrival(frame)
             self._execute_protocol_response(response, simulator)
         else:
             # Frame corrupto - protocolo decide qué hacer
-            response = self.protocol.handle_frame_corruption(frame)
+            response = self._on_frame_corruption(frame)
             self._execute_protocol_response(response, simulator)
 
     def handle_network_layer_ready(self, network_layer, simulator) -> None:
         """Coordina datos de NetworkLayer con protocolo."""
         # Protocolo decide qué hacer
-        response = self.protocol.handle_network_layer_ready(network_layer, self, simulator)
+        response = self._on_network_layer_ready(network_layer, self, simulator)
         self._execute_protocol_response(response, simulator)
 
     def _execute_protocol_response(self, response: dict, simulator) -> None:
         """Ejecuta la acción decidida por el protocolo."""
-        action = response.get('action', 'no_action')
-        
-        if action == 'send_frame':
-            # Enviar frame
-            print(f"  [DataLink-{self.machine_id}] Enviando {response['frame']}")
-            event = Event("SEND_FRAME", simulator.get_current_time(),
-                         self.machine_id, {
-                             'frame': response['frame'],
-                             'destination': response['destination']
-                         })
-            simulator.schedule_event(event)
-            
-        elif action == 'deliver_packet':
-            # Entregar paquete a Network Layer
-            event = Event("DELIVER_PACKET", simulator.get_current_time(),
-                         self.machine_id, response['packet'])
-            simulator.schedule_event(event)
-            
-        elif action == 'deliver_packet_and_send_ack':
-            # Entregar paquete Y enviar ACK
-            # 1. Entregar paquete
-            event = Event("DELIVER_PACKET", simulator.get_current_time(),
-                         self.machine_id, response['packet'])
-            simulator.schedule_event(event)
-            
-            # 2. Enviar ACK
-            ack_frame = Frame("ACK", 0, response['ack_seq'])
-            print(f"  [DataLink-{self.machine_id}] Enviando ACK seq={response['ack_seq']}")
-            event = Event("SEND_FRAME", simulator.get_current_time() + 0.1,
-                         self.machine_id, {
-                             'frame': ack_frame,
-                             'destination': 'A'  # PAR: B siempre responde a A
-                         })
-            simulator.schedule_event(event)
-            
-        elif action == 'send_nak':
-            # Enviar NAK
-            nak_frame = Frame("NAK", 0, response['nak_seq'])
-            print(f"  [DataLink-{self.machine_id}] Enviando NAK seq={response['nak_seq']}")
-            event = Event("SEND_FRAME", simulator.get_current_time() + 0.1,
-                         self.machine_id, {
-                             'frame': nak_frame,
-                             'destination': 'A'  # PAR: B siempre responde a A
-                         })
-            simulator.schedule_event(event)
-            
-        elif action == 'send_ack_only':
-            # Enviar solo ACK (sin entregar paquete - para frames duplicados)
-            ack_frame = Frame("ACK", 0, response['ack_seq'])
-            print(f"  [DataLink-{self.machine_id}] Enviando ACK seq={response['ack_seq']} (frame duplicado)")
-            event = Event("SEND_FRAME", simulator.get_current_time() + 0.1,
-                         self.machine_id, {
-                             'frame': ack_frame,
-                             'destination': 'A'
-                         })
-            simulator.schedule_event(event)
-            
-        elif action == 'send_ack_individual':
-            # Enviar ACK individual (Selective Repeat)
-            ack_frame = Frame("ACK", 0, response['ack_seq'])
-            print(f"  [DataLink-{self.machine_id}] Enviando ACK individual seq={response['ack_seq']}")
-            event = Event("SEND_FRAME", simulator.get_current_time() + 0.1,
-                         self.machine_id, {
-                             'frame': ack_frame,
-                             'destination': self._get_other_machine_id()
-                         })
-            simulator.schedule_event(event)
-            
-        elif action == 'deliver_packets_and_send_ack':
-            # Entregar múltiples paquetes Y enviar ACK (Selective Repeat)
-            # 1. Entregar paquetes
-            for packet in response['packets']:
-                event = Event("DELIVER_PACKET", simulator.get_current_time(),
-                             self.machine_id, packet)
-                simulator.schedule_event(event)
-            
-            # 2. Enviar ACK
-            ack_frame = Frame("ACK", 0, response['ack_seq'])
-            print(f"  [DataLink-{self.machine_id}] Entregando {len(response['packets'])} paquetes y enviando ACK seq={response['ack_seq']}")
-            event = Event("SEND_FRAME", simulator.get_current_time() + 0.1,
-                         self.machine_id, {
-                             'frame': ack_frame,
-                             'destination': self._get_other_machine_id()
-                         })
-            simulator.schedule_event(event)
-            
-        elif action == 'continue_sending':
-            # Continuar enviando - programar siguiente dato si hay
-            event = Event(EventType.NETWORK_LAYER_READY,
-                         simulator.get_current_time() + 0.1,
-                         self.machine_id)
+        if response.get('restart_timer'):
+            # El protocolo pide reiniciar su timer (p.ej. ACK que avanza la ventana)
+            self.protocol.restart_timer(simulator)
+
+        # Una búsqueda en la tabla en lugar de comparar contra cada acción;
+        # 'no_action' (y cualquier acción desconocida) no requiere procesamiento
+        handler = self._action_handlers.get(response.get('action'))
+        if handler is not None:
+            handler(self, response, simulator, simulator.get_current_time())
+
+    def _do_send_frame(self, response: dict, simulator, now: float) -> None:
+        # Enviar frame
+        log.debug("  [DataLink-%s] Enviando %s", self.machine_id, response['frame'])
+        event = Event(EventType.SEND_FRAME, now,
+                     self.machine_id, {
+                         'frame': response['frame'],
+                         'destination': response['destination']
+                     })
+        simulator.schedule_event(event)
+
+    def _do_send_multiple_frames(self, response: dict, simulator, now: float) -> None:
+        # Enviar varios frames de una vez (p.ej. retransmisión Go-Back-N)
+        log.debug("  [DataLink-%s] Enviando %s frame(s)", self.machine_id, len(response['frames']))
+        machine_id = self.machine_id
+        simulator.schedule_events([Event(EventType.SEND_FRAME, now, machine_id, frame_data)
+                                   for frame_data in response['frames']])
+
+    def _do_deliver_packet(self, response: dict, simulator, now: float) -> None:
+        # Entregar paquete a Network Layer
+        event = Event(EventType.DELIVER_PACKET, now,
+                     self.machine_id, [response['packet']])
+        simulator.schedule_event(event)
+
+    def _do_deliver_and_ack(self, response: dict, simulator, now: float) -> None:
+        # Entregar paquetes (puede no haber: duplicado/fuera de orden) Y enviar ACK
+        packets = response['packets']
+
+        # 1. Entregar todos los paquetes en un solo evento
+        if packets:
+            event = Event(EventType.DELIVER_PACKET, now,
+                         self.machine_id, packets)
             simulator.schedule_event(event)
-            
-        elif action == 'retransmit':
-            # El protocolo maneja el reenvío internamente
-            pass
-            
-        # 'no_action' no requiere procesamiento
+            log.debug("  [DataLink-%s] Entregando %s paquete(s) y enviando ACK seq=%s", self.machine_id, len(packets), response['ack_seq'])
+        else:
+            log.debug("  [DataLink-%s] Enviando ACK seq=%s (sin entrega)", self.machine_id, response['ack_seq'])
+
+        # 2. Enviar ACK
+        ack_frame = self._get_control_frame(FrameType.ACK, response['ack_seq'])
+        event = Event(EventType.SEND_FRAME, now + 0.1,
+                     self.machine_id, {
+                         'frame': ack_frame,
+                         'destination': self._peer_id
+                     })
+        simulator.schedule_event(event)
+
+    def _do_send_nak(self, response: dict, simulator, now: float) -> None:
+        # Enviar NAK
+        nak_frame = self._get_control_frame(FrameType.NAK, response['nak_seq'])
+        log.debug("  [DataLink-%s] Enviando NAK seq=%s", self.machine_id, response['nak_seq'])
+        event = Event(EventType.SEND_FRAME, now + 0.1,
+                     self.machine_id, {
+                         'frame': nak_frame,
+                         'destination': 'A'  # PAR: B siempre responde a A
+                     })
+        simulator.schedule_event(event)
+
+    def _do_continue_sending(self, response: dict, simulator, now: float) -> None:
+        # Continuar enviando - programar siguiente dato si hay
+        event = Event(EventType.NETWORK_LAYER_READY,
+                     now + 0.1,
+                     self.machine_id)
+        simulator.schedule_event(event)
+
+    # Acción del protocolo -> método que la ejecuta. 'retransmit' no está:
+    # el protocolo maneja el reenvío internamente.
+    _action_handlers = {
+        'send_frame': _do_send_frame,
+        'send_multiple_frames': _do_send_multiple_frames,
+        'deliver_packet': _do_deliver_packet,
+        'deliver_and_ack': _do_deliver_and_ack,
+        'send_nak': _do_send_nak,
+        'continue_sending': _do_continue_sending,
+    }
+
+    def _get_control_frame(self, frame_type: FrameType, ack_num: int) -> Frame:
+        """Obtiene el frame ACK/NAK para ack_num, creándolo la primera vez."""
+        key = (frame_type, ack_num)
+        frame = self._control_frames.get(key)
+        if frame is None:
+            frame = self._control_frames[key] = Frame(frame_type, 0, ack_num)
+        return frame
 
     def _get_other_machine_id(self) -> str:
         """Obtiene el ID de la otra máquina (para comunicación bidireccional)."""
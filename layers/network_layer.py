@@ -1,5 +1,8 @@
+import logging
 from models.packet import Packet
 
+log = logging.getLogger(__name__)
+
 class NetworkLayer:
     def __init__(self, machine_id: str):
         self.machine_id = machine_id
@@ -15,7 +18,7 @@ class NetworkLayer:
         """Agrega datos específicos a la cola de envío con destino"""
         message = {'data': data, 'destination': destination}
         self.pending_data.append(message)
-        print(f"  [NetworkLayer-{self.machine_id}] Datos agregados a cola: '{data}' -> {destination}")
+        log.info("  [NetworkLayer-%s] Datos agregados a cola: '%s' -> %s", self.machine_id, data, destination)
 
     def get_packet(self) -> tuple:
         # Toma el siguiente dato de la cola y retorna (packet, destination)
@@ -23,7 +26,7 @@ class NetworkLayer:
             message = self.pending_data.pop(0)
             packet = Packet(message['data'])
             destination = message['destination']
-            print(f"  [NetworkLayer-{self.machine_id}] Generado: {packet} -> {destination}")
+            log.debug("  [NetworkLayer-%s] Generado: %s -> %s", self.machine_id, packet, destination)
             return packet, destination
         return None, None
 
@@ -31,7 +34,7 @@ class NetworkLayer:
         # Entrega el paquete recibido a la aplicación
         self.received_packets.append(packet)
         self._packets_received += 1  # Incrementar contador
-        print(f"  [NetworkLayer-{self.machine_id}] Entregado a aplicación: {packet}")
+        log.info("  [NetworkLayer-%s] Entregado a aplicación: %s", self.machine_id, packet)
     
     def deliver_packets(self, packets):
         # Entrega múltiples paquetes (para Selective Repeat)
@@ -1,7 +1,10 @@
+import logging
 import random
 from models.frame import Frame
 from models.events import Event, EventType
 
+log = logging.getLogger(__name__)
+
 
 class PhysicalLayer:
     """Capa física individual por máquina con configuración propia."""
@@ -25,11 +28,11 @@ class PhysicalLayer:
     def send_frame(self, frame: Frame, destination_id: str, simulator) -> None:
         """Envía un frame con posible corrupción y retardo."""
         if self.is_paused:
-            print(f"  [PhysicalLayer-{self.machine_id}] Transmisión pausada")
+            log.debug("  [PhysicalLayer-%s] Transmisión pausada", self.machine_id)
             return
 
         self.frames_sent += 1
-        print(f"  [PhysicalLayer-{self.machine_id}] Enviando {frame} hacia {destination_id}")
+        log.debug("  [PhysicalLayer-%s] Enviando %s hacia %s", self.machine_id, frame, destination_id)
 
         # Crear una copia del frame para cada transmisión (nueva oportunidad de corrupción)
         frame_copy = Frame(frame.type, frame.seq_num, frame.ack_num, frame.packet)
@@ -37,7 +40,7 @@ class PhysicalLayer:
         # Simula corrupción según tasa de errores (cada transmisión es independiente)
         if random.random() < self.error_rate:
             frame_copy.corrupted_by_physical = True
-            print(f"  [PhysicalLayer-{self.machine_id}] ¡Frame corrupto durante transmisión!")
+            log.debug("  [PhysicalLayer-%s] ¡Frame corrupto durante transmisión!", self.machine_id)
 
         # Calcula tiempo de llegada con retardo
         arrival_time = simulator.get_current_time() + self.transmission_delay
@@ -52,24 +55,24 @@ class PhysicalLayer:
         if not (0.0 <= error_rate <= 1.0):
             raise ValueError("Error rate debe estar entre 0.0 y 1.0")
         self.error_rate = error_rate
-        print(f"  [PhysicalLayer-{self.machine_id}] Tasa de errores actualizada a: {error_rate}")
+        log.info("  [PhysicalLayer-%s] Tasa de errores actualizada a: %s", self.machine_id, error_rate)
 
     def set_transmission_delay(self, delay: float) -> None:
         """Configura el retardo de transmisión para esta máquina."""
         if delay < 0:
             raise ValueError("Transmission delay debe ser no negativo")
         self.transmission_delay = delay
-        print(f"  [PhysicalLayer-{self.machine_id}] Retardo actualizado a: {delay}s")
+        log.info("  [PhysicalLayer-%s] Retardo actualizado a: %ss", self.machine_id, delay)
 
     def pause(self) -> None:
         """Pausa las transmisiones de esta máquina."""
         self.is_paused = True
-        print(f"  [PhysicalLayer-{self.machine_id}] Transmisión pausada")
+        log.info("  [PhysicalLayer-%s] Transmisión pausada", self.machine_id)
 
     def resume(self) -> None:
         """Reanuda las transmisiones de esta máquina."""
         self.is_paused = False
-        print(f"  [PhysicalLayer-{self.machine_id}] Transmisión reanudada")
+        log.info("  [PhysicalLayer-%s] Transmisión reanudada", self.machine_id)
 
     def get_error_rate(self) -> float:
         """Obtiene la tasa de errores actual."""
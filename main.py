@@ -5,11 +5,22 @@ Este main puede funcionar con cualquier protocolo que implemente ProtocolInterfa
 
 import time
 import importlib
+import logging
+import os
 import sys
 from typing import Type, Optional
 from simulation.simulator import Simulator
 from protocols.protocol_interface import ProtocolInterface
 
+# Configuración por defecto (la misma que proponen los prompts)
+DEFAULT_CONFIG = {
+    'machine_a_error_rate': 0.0,
+    'machine_a_delay': 2.0,
+    'machine_b_error_rate': 0.0,
+    'machine_b_delay': 1.5,
+    'send_interval': 1.5
+}
+
 
 def get_available_protocols() -> dict:
     """
@@ -129,13 +140,7 @@ def configure_simulation() -> dict:
     except ValueError as e:
         print(f"❌ Error en configuración: {e}")
         print("🔄 Usando valores por defecto...")
-        config = {
-            'machine_a_error_rate': 0.0,
-            'machine_a_delay': 2.0,
-            'machine_b_error_rate': 0.0,
-            'machine_b_delay': 1.5,
-            'send_interval': 1.5
-        }
+        config = dict(DEFAULT_CONFIG)
     
     return config
 
@@ -179,9 +184,10 @@ def run_simulation(protocol_class: Type[ProtocolInterface], config: dict):
 
     alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
     index = 0
+    letters = config.get('letters')  # None = enviar hasta Ctrl+C
 
     try:
-        while True:
+        while letters is None or index < letters:
             letter = alphabet[index % len(alphabet)]
 
             # Enviar la letra
@@ -206,20 +212,42 @@ def run_simulation(protocol_class: Type[ProtocolInterface], config: dict):
         print("\n✅ Simulación completada!")
 
 
-def main():
-    """Función principal del simulador modular."""
+def main(config: Optional[dict] = None):
+    """
+    Función principal del simulador modular.
+
+    Args:
+        config: Configuración para ejecutar sin prompts (p.ej. desde otro
+            script en el mismo proceso). 'protocol' es el nombre del
+            protocolo, 'letters' cuántas letras enviar; las claves que
+            falten toman los valores de DEFAULT_CONFIG.
+    """
+    # Las trazas del simulador van por logging (DEBUG) y se muestran junto a los print;
+    # SIM_QUIET=1 deja solo advertencias y errores (sin costo de formateo por evento)
+    level = logging.WARNING if os.environ.get('SIM_QUIET') == '1' else logging.DEBUG
+    logging.basicConfig(level=level, format="%(message)s", stream=sys.stdout)
+
     print("🌐 Simulador de Protocolos de Red - Versión Modular")
     print("=" * 55)
     
     try:
-        # Seleccionar protocolo
-        protocol_class = select_protocol()
-        if protocol_class is None:
-            print("👋 Simulación cancelada por el usuario.")
-            return
-        
-        # Configurar simulación
-        config = configure_simulation()
+        if config is not None:
+            # Modo no interactivo: protocolo y parámetros vienen del llamador
+            available_protocols = get_available_protocols()
+            protocol_class = available_protocols.get(config.get('protocol'))
+            if protocol_class is None:
+                raise ValueError(f"Protocolo desconocido: {config.get('protocol')!r} "
+                                 f"(disponibles: {', '.join(available_protocols)})")
+            config = {**DEFAULT_CONFIG, **config}
+        else:
+            # Seleccionar protocolo
+            protocol_class = select_protocol()
+            if protocol_class is None:
+                print("👋 Simulación cancelada por el usuario.")
+                return
+
+            # Configurar simulación
+            config = configure_simulation()
         
         # Ejecutar simulación
         run_simulation(protocol_class, config)
@@ -1,16 +1,26 @@
-from enum import Enum
+from enum import IntEnum
 
 
-class EventType(Enum):
-    # Tipos de eventos del simulador
-    FRAME_ARRIVAL = "frame_arrival"
-    CKSUM_ERR = "cksum_err"
-    TIMEOUT = "timeout"
-    ACK_TIMEOUT = "ack_timeout"
-    NETWORK_LAYER_READY = "network_layer_ready"
+class EventType(IntEnum):
+    # Tipos de eventos del simulador (enteros: hash y comparación más baratos que strings)
+    FRAME_ARRIVAL = 0
+    CKSUM_ERR = 1
+    TIMEOUT = 2
+    ACK_TIMEOUT = 3
+    NETWORK_LAYER_READY = 4
+    DELIVER_PACKET = 5
+    SEND_FRAME = 6
+
+
+# Valor de Event.data en un TIMEOUT reemplazado por otro más temprano antes
+# de dispararse: sigue en la cola pero Machine lo ignora
+TIMEOUT_SUPERSEDED = object()
 
 
 class Event:
+    # Sin __dict__ por instancia: se crea un Event por cada paso de la simulación
+    __slots__ = ('event_type', 'timestamp', 'machine_id', 'data')
+
     def __init__(self, event_type: EventType, timestamp: float, machine_id: str, data = None):
         self.event_type = event_type
         self.timestamp = timestamp
@@ -24,4 +34,4 @@ class Event:
     def __str__(self) -> str:
         # Representación legible del evento
         data_info = f", data={type(self.data).__name__}" if self.data is not None else ""
-        return f"Event({self.event_type.value}, t={self.timestamp:.2f}, machine={self.machine_id}{data_info})"
\ No newline at end of file
+        return f"Event({self.event_type.name.lower()}, t={self.timestamp:.2f}, machine={self.machine_id}{data_info})"
\ No newline at end of file
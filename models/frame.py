@@ -1,6 +1,19 @@
+from enum import IntEnum
+
+
+class FrameType(IntEnum):
+    # Tipos de frame (enteros: comparación más barata que strings)
+    DATA = 0
+    ACK = 1
+    NAK = 2
+
+
 class Frame:
-    def __init__(self, frame_type: str, seq_num: int, ack_num: int, packet=None):
-        self.type = frame_type          # "DATA", "ACK", "NAK"
+    # Sin __dict__ por instancia: se crea un Frame por cada transmisión
+    __slots__ = ('type', 'seq_num', 'ack_num', 'packet', 'corrupted_by_physical')
+
+    def __init__(self, frame_type: FrameType, seq_num: int, ack_num: int, packet=None):
+        self.type = frame_type          # FrameType.DATA, FrameType.ACK, FrameType.NAK
         self.seq_num = seq_num          # Número de secuencia
         self.ack_num = ack_num          # Número de confirmación
         self.packet = packet            # Objeto Packet o None
@@ -11,7 +24,7 @@ class Frame:
     def __str__(self):
         packet_info = f", packet={self.packet}" if self.packet else ""
         corruption = " [CORRUPTED]" if self.corrupted_by_physical else ""
-        return f"Frame(type={self.type}, seq={self.seq_num}, ack={self.ack_num}{packet_info}){corruption}"
+        return f"Frame(type={self.type.name}, seq={self.seq_num}, ack={self.ack_num}{packet_info}){corruption}"
 
     def __repr__(self):
         return self.__str__()
\ No newline at end of file
@@ -7,33 +7,74 @@ Protocolo Go-Back-N (GBN)
 - ACKs acumulativos
 """
 
-from models.frame import Frame
+import logging
+from collections import deque
+from types import MappingProxyType
+
+from models.frame import Frame, FrameType
 from models.events import Event, EventType
-from protocols.protocol_interface import ProtocolInterface
+from protocols.protocol_interface import ProtocolInterface, NO_ACTION, CONTINUE_SENDING
+
+log = logging.getLogger(__name__)
+
+# ACK que avanza la ventana sin vaciarla: seguir enviando y reiniciar el timer
+_CONTINUE_RESTART_TIMER = MappingProxyType({'action': 'continue_sending', 'restart_timer': True})
 
 
 class GoBackNProtocol(ProtocolInterface):
-    """Protocolo Go-Back-N compatible con la arquitectura modular del simulador."""
+    """
+    Protocolo Go-Back-N compatible con la arquitectura modular del simulador.
+
+    window_size debe ser una potencia de 2 (1, 2, 4, 8...): el espacio de
+    secuencia 2N se recorre con una máscara de bits. Otro valor lanza
+    ValueError al construir el protocolo.
+    """
+
+    # Atributos fijos: sin __dict__ por instancia, acceso por slot
+    __slots__ = (
+        'window_size', 'max_seq_num', '_seq_mask',
+        'send_base', 'next_seq_num', 'send_buffer',
+        'expected_seq_num', 'last_ack_sent',
+        'timeout_duration', 'timeout_event_scheduled', 'timer_deadline', '_timeout_event',
+        '_arrival_dispatch',
+        'sent_frames', 'received_frames', 'acks_sent', 'acks_received', 'retransmissions',
+    )
+
+    # Atributos reportados por get_stats (definidos una sola vez por clase)
+    _STATS_KEYS = (
+        'window_size', 'send_base', 'next_seq_num', 'expected_seq_num',
+        'sent_frames', 'received_frames', 'acks_sent', 'acks_received',
+        'retransmissions',
+    )
 
     def __init__(self, machine_id: str, window_size: int = 4):
         super().__init__(machine_id)
         self.machine_id = machine_id
 
         # --- Parámetros de ventana ---
+        if window_size <= 0 or window_size & (window_size - 1):
+            raise ValueError(f"Window size debe ser una potencia de 2 (1, 2, 4, 8...), se recibió {window_size}")
         self.window_size = window_size
         self.max_seq_num = 2 * window_size  # Espacio circular (al menos 2N)
+        self._seq_mask = self.max_seq_num - 1  # x % max_seq_num == x & _seq_mask
 
         # --- Estado del emisor ---
         self.send_base = 0            # Primer frame no confirmado
         self.next_seq_num = 0         # Próximo número de secuencia a enviar
-        self.send_buffer = {}         # {seq_num: {'frame': Frame, 'destination': str}}
+        self.send_buffer = deque()    # (Frame, destino) en orden de envío, desde send_base
 
         # --- Estado del receptor ---
         self.expected_seq_num = 0     # Solo 1 frame válido a la vez (ventana de recepción = 1)
+        self.last_ack_sent = self.max_seq_num - 1  # Último frame aceptado = ACK piggybacked (expected_seq_num - 1)
 
         # --- Control de timeout (global para la base) ---
         self.timeout_duration = 4.0
-        self.timeout_event_scheduled = False
+        self.timeout_event_scheduled = False  # Hay un evento TIMEOUT en la cola
+        self.timer_deadline = None            # Vencimiento vigente (None = timer detenido)
+        self._timeout_event = Event(EventType.TIMEOUT, 0.0, machine_id)  # Reutilizado en cada armado
+
+        # Manejador por tipo de frame, indexado por FrameType (DATA, ACK, NAK)
+        self._arrival_dispatch = (self._handle_data_frame, self._handle_ack_frame, self._ignore_frame)
 
         # --- Métricas ---
         self.sent_frames = 0
@@ -46,152 +87,164 @@ class GoBackNProtocol(ProtocolInterface):
         """Cuando hay datos listos para enviar desde la capa de red."""
         # Verificar espacio disponible en ventana
         if self._window_full():
-            print(f"[GBN-{self.machine_id}] Ventana llena, no se puede enviar nuevo frame")
-            return {'action': 'no_action'}
+            log.debug("[GBN-%s] Ventana llena, no se puede enviar nuevo frame", self.machine_id)
+            return NO_ACTION
 
         # Tomar packet y destino de la capa de red
         if network_layer.has_data_ready():
             packet, destination = network_layer.get_packet()
             if packet and destination:
-                frame = Frame("DATA", self.next_seq_num, (self.expected_seq_num - 1) % self.max_seq_num, packet)
-                print(f"[GBN-{self.machine_id}] Enviando DATA seq={self.next_seq_num} → {destination}")
+                seq = self.next_seq_num
+                frame = Frame(FrameType.DATA, seq, self.last_ack_sent, packet)
+                log.debug("[GBN-%s] Enviando DATA seq=%s → %s", self.machine_id, seq, destination)
 
                 # Guardar en buffer
-                self.send_buffer[self.next_seq_num] = {
-                    'frame': frame,
-                    'destination': destination
-                }
+                self.send_buffer.append((frame, destination))
 
                 self.sent_frames += 1
                 # Si es el primer frame de la ventana, programar timeout global
-                if not self.timeout_event_scheduled:
+                if self.timer_deadline is None:
                     self._schedule_timeout(simulator)
 
                 # Avanzar secuencia circularmente
-                self.next_seq_num = (self.next_seq_num + 1) % self.max_seq_num
+                self.next_seq_num = (seq + 1) & self._seq_mask
 
                 return {'action': 'send_frame', 'frame': frame, 'destination': destination}
 
-        return {'action': 'no_action'}
+        return NO_ACTION
 
     def handle_frame_arrival(self, frame: Frame) -> dict:
         """Procesa llegada de un frame (DATA o ACK)."""
-        if frame.type == "DATA":
-            seq = frame.seq_num
-            if seq == self.expected_seq_num:
-                print(f"[GBN-{self.machine_id}] DATA seq={seq} correcto → entregar y enviar ACK")
-                self.received_frames += 1
-                self.acks_sent += 1
-                self.expected_seq_num = (self.expected_seq_num + 1) % self.max_seq_num
-                return {
-                    'action': 'deliver_packet_and_send_ack',
-                    'packet': frame.packet,
-                    'ack_seq': seq
-                }
-            else:
-                print(f"[GBN-{self.machine_id}] DATA seq={seq} fuera de orden → reenviar último ACK {(self.expected_seq_num - 1) % self.max_seq_num}")
-                self.acks_sent += 1
-                return {
-                    'action': 'send_ack_only',
-                    'ack_seq': (self.expected_seq_num - 1) % self.max_seq_num
-                }
-
-        elif frame.type == "ACK":
-            ack = frame.ack_num
-            # ACK acumulativo
-            if self._in_window(self.send_base, ack):
-                print(f"[GBN-{self.machine_id}] ACK {ack} acumulativo → avanzar base")
-                self.acks_received += 1
-                old_base = self.send_base
-                self.send_base = (ack + 1) % self.max_seq_num
-
-                # Eliminar frames confirmados del buffer
-                seq = old_base
-                while seq != self.send_base:
-                    self.send_buffer.pop(seq, None)
-                    seq = (seq + 1) % self.max_seq_num
-
-                # Reprogramar o cancelar timeout
-                if self.send_base == self.next_seq_num:
-                    self.timeout_event_scheduled = False
-                else:
-                    self._schedule_timeout(simulator)
-
-                return {'action': 'continue_sending'}
-            else:
-                print(f"[GBN-{self.machine_id}] ACK {ack} duplicado o fuera de ventana → ignorar")
-                return {'action': 'no_action'}
-
-        return {'action': 'no_action'}
+        # Despacho por tipo: una indexación en lugar de comparaciones encadenadas
+        return self._arrival_dispatch[frame.type](frame)
+
+    def _handle_data_frame(self, frame: Frame) -> dict:
+        """Receptor: ventana de tamaño 1, solo acepta expected_seq_num."""
+        seq = frame.seq_num
+        if seq == self.expected_seq_num:
+            log.debug("[GBN-%s] DATA seq=%s correcto → entregar y enviar ACK", self.machine_id, seq)
+            self.received_frames += 1
+            self.acks_sent += 1
+            self.expected_seq_num = (seq + 1) & self._seq_mask
+            self.last_ack_sent = seq
+            return {
+                'action': 'deliver_and_ack',
+                'packets': [frame.packet],
+                'ack_seq': seq
+            }
+        else:
+            log.debug("[GBN-%s] DATA seq=%s fuera de orden → reenviar último ACK %s", self.machine_id, seq, self.last_ack_sent)
+            self.acks_sent += 1
+            return {
+                'action': 'deliver_and_ack',
+                'packets': [],
+                'ack_seq': self.last_ack_sent
+            }
+
+    def _handle_ack_frame(self, frame: Frame) -> dict:
+        """Emisor: ACK acumulativo que puede confirmar varios frames."""
+        ack = frame.ack_num
+        base = self.send_base
+        mask = self._seq_mask
+        # ACK acumulativo: válido solo si confirma algún frame pendiente
+        # [send_base, next_seq_num). Duplicados, ACKs fuera de ventana y
+        # ventana vacía (len == 0) se descartan con una sola comparación.
+        dist = (ack - base) & mask
+        if dist >= len(self.send_buffer):
+            log.debug("[GBN-%s] ACK %s duplicado o fuera de ventana → ignorar", self.machine_id, ack)
+            return NO_ACTION
+
+        log.debug("[GBN-%s] ACK %s acumulativo → avanzar base", self.machine_id, ack)
+        self.acks_received += 1
+        count = dist + 1
+        new_base = (base + count) & mask
+        self.send_base = new_base
+
+        # Liberar los frames confirmados (siempre los más antiguos)
+        popleft = self.send_buffer.popleft
+        for _ in range(count):
+            popleft()
+
+        # Detener el timer o reiniciarlo para la nueva base
+        if new_base == self.next_seq_num:
+            self.timer_deadline = None
+            return CONTINUE_SENDING
+
+        return _CONTINUE_RESTART_TIMER
+
+    def _ignore_frame(self, frame: Frame) -> dict:
+        """Tipos de frame que Go-Back-N no usa (NAK)."""
+        return NO_ACTION
 
     def handle_frame_corruption(self, frame: Frame) -> dict:
         """Frame corrupto detectado por la capa física."""
-        print(f"[GBN-{self.machine_id}] Frame corrupto → ignorar (retransmisión)")
-        return {'action': 'no_action'}
+        log.debug("[GBN-%s] Frame corrupto → ignorar (retransmisión)", self.machine_id)
+        return NO_ACTION
 
     def handle_timeout(self, simulator) -> dict:
         """Retransmite todos los frames pendientes desde send_base."""
-        if not self.send_buffer:
-            print(f"[GBN-{self.machine_id}] TIMEOUT sin frames pendientes → ignorar")
-            self.timeout_event_scheduled = False
-            return {'action': 'no_action'}
-
-        print(f"[GBN-{self.machine_id}] TIMEOUT → retransmitiendo todos los frames desde base {self.send_base}")
-        actions = []
-        seq = self.send_base
-        while seq != self.next_seq_num:
-            frame_info = self.send_buffer.get(seq)
-            if frame_info:
-                frame = frame_info['frame']
-                destination = frame_info['destination']
-                print(f"   ↻ Reenviando DATA seq={seq}")
-                actions.append({'action': 'send_frame', 'frame': frame, 'destination': destination})
-                self.retransmissions += 1
-            seq = (seq + 1) % self.max_seq_num
+        self.timeout_event_scheduled = False
+
+        if self.send_base == self.next_seq_num or self.timer_deadline is None:
+            log.debug("[GBN-%s] TIMEOUT sin frames pendientes → ignorar", self.machine_id)
+            self.timer_deadline = None
+            return NO_ACTION
+
+        if simulator.get_current_time() < self.timer_deadline:
+            # El timer fue reiniciado después de programar este evento
+            self._arm_timeout_event(simulator)
+            return NO_ACTION
+
+        # El buffer ya está en orden de envío desde send_base; el ACK
+        # piggybacked vigente (cacheado en last_ack_sent) se lee una vez
+        piggy_ack = self.last_ack_sent
+        frames = []
+        for frame, destination in self.send_buffer:
+            frame.ack_num = piggy_ack
+            frames.append({'frame': frame, 'destination': destination})
+        self.retransmissions += len(frames)
+
+        log.debug("[GBN-%s] TIMEOUT → retransmitiendo %s frame(s) desde base %s",
+                  self.machine_id, len(frames), self.send_base)
 
         # Reprogramar timeout global
         self._schedule_timeout(simulator)
-        return actions[0] if actions else {'action': 'no_action'}
+        return {'action': 'send_multiple_frames', 'frames': frames}
+
+    def restart_timer(self, simulator) -> None:
+        """Reinicia el timeout global para la nueva base de la ventana."""
+        self._schedule_timeout(simulator)
 
     def _schedule_timeout(self, simulator):
-        """Programa un timeout global para la ventana de envío."""
-        timeout_event = Event(
-            EventType.TIMEOUT,
-            simulator.get_current_time() + self.timeout_duration,
-            self.machine_id
-        )
-        simulator.schedule_event(timeout_event)
-        self.timeout_event_scheduled = True
-        print(f"[GBN-{self.machine_id}] Timeout programado en {self.timeout_duration}s")
+        """Programa (o reinicia) el timeout global para la ventana de envío."""
+        self.timer_deadline = simulator.get_current_time() + self.timeout_duration
+        self._arm_timeout_event(simulator)
+        log.debug("[GBN-%s] Timeout programado en %ss", self.machine_id, self.timeout_duration)
+
+    def events_cancelled(self) -> None:
+        """El evento TIMEOUT reutilizable salió de la cola: permitir re-encolarlo."""
+        self.timeout_event_scheduled = False
+
+    def _arm_timeout_event(self, simulator):
+        """
+        Encola un evento TIMEOUT para el vencimiento vigente.
+
+        Si ya hay uno en la cola no se encola otro: al dispararse antes de
+        tiempo, handle_timeout lo vuelve a encolar para timer_deadline.
+        Así un reinicio no requiere cancelar eventos en el heap.
+        """
+        if not self.timeout_event_scheduled:
+            self._timeout_event.timestamp = self.timer_deadline
+            simulator.schedule_event(self._timeout_event)
+            self.timeout_event_scheduled = True
 
     def _window_full(self) -> bool:
         """True si la ventana de envío está llena."""
-        if self.send_base <= self.next_seq_num:
-            return (self.next_seq_num - self.send_base) >= self.window_size
-        else:
-            return (self.next_seq_num + self.max_seq_num - self.send_base) >= self.window_size
-
-    def _in_window(self, base: int, ack: int) -> bool:
-        """Verifica si un ACK está dentro del rango de la ventana actual."""
-        if base <= ack < (base + self.window_size) % self.max_seq_num:
-            return True
-        if (base + self.window_size) >= self.max_seq_num:
-            return ack < ((base + self.window_size) % self.max_seq_num) or ack >= base
-        return False
+        return len(self.send_buffer) >= self.window_size
 
     def get_stats(self) -> dict:
         stats = super().get_stats()
-        stats.update({
-            'window_size': self.window_size,
-            'send_base': self.send_base,
-            'next_seq_num': self.next_seq_num,
-            'expected_seq_num': self.expected_seq_num,
-            'sent_frames': self.sent_frames,
-            'received_frames': self.received_frames,
-            'acks_sent': self.acks_sent,
-            'acks_received': self.acks_received,
-            'retransmissions': self.retransmissions,
-        })
+        stats.update({key: getattr(self, key) for key in self._STATS_KEYS})
         return stats
 
     def get_protocol_name(self) -> str:
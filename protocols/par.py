@@ -6,13 +6,24 @@ Protocolo PAR (Positive Acknowledgment with Retransmission)
 - Números de secuencia alternantes (0,1)
 """
 
-from models.frame import Frame
+import logging
+
+from models.frame import Frame, FrameType
 from models.events import Event, EventType
-from protocols.protocol_interface import ProtocolInterface
+from protocols.protocol_interface import ProtocolInterface, NO_ACTION, CONTINUE_SENDING
+
+log = logging.getLogger(__name__)
 
 
 class PARProtocol(ProtocolInterface):
 
+    # Atributos fijos: sin __dict__ por instancia, acceso por slot
+    __slots__ = (
+        'seq_num', 'expected_seq', 'waiting_for_ack', 'last_frame_sent', '_data_frames',
+        'last_destination', 'timeout_duration', 'timeout_event_scheduled',
+        'timer_deadline', '_timeout_event', '_arrival_dispatch',
+    )
+
     def __init__(self, machine_id: str):
         # Inicializa el protocolo PAR.
         super().__init__(machine_id)
@@ -25,10 +36,17 @@ class PARProtocol(ProtocolInterface):
         self.waiting_for_ack = False  # Si está esperando ACK o no
         self.last_frame_sent = None  # Último frame enviado
         self.last_destination = None  # Destino del último frame
+        # Un frame DATA por número de secuencia (0/1), reutilizado en cada envío
+        self._data_frames = (Frame(FrameType.DATA, 0, 0), Frame(FrameType.DATA, 1, 0))
         
-        # Timeouts
+        # Timeouts: un único evento TIMEOUT reutilizado, re-armado en el lugar
         self.timeout_duration = 5.0  # Segundos para timeout
-        self.timeout_event_scheduled = False
+        self.timeout_event_scheduled = False  # El evento está en la cola
+        self.timer_deadline = None            # Vencimiento vigente (None = timer detenido)
+        self._timeout_event = Event(EventType.TIMEOUT, 0.0, machine_id)
+
+        # Manejador por tipo de frame, indexado por FrameType (DATA, ACK, NAK)
+        self._arrival_dispatch = (self._handle_data_frame, self._handle_ack_frame, self._handle_nak_frame)
 
     def handle_network_layer_ready(self, network_layer, data_link_layer, simulator) -> dict:
         
@@ -36,14 +54,16 @@ class PARProtocol(ProtocolInterface):
         
         # Solo procesar si no estamos esperando ACK
         if self.waiting_for_ack:
-            print(f"[PAR-{self.machine_id}] Esperando ACK, no se pueden enviar más datos")
-            return {'action': 'no_action'}
+            log.debug("[PAR-%s] Esperando ACK, no se pueden enviar más datos", self.machine_id)
+            return NO_ACTION
         
         if network_layer.has_data_ready():
             packet, destination = network_layer.get_packet()
             if packet and destination:
-                # Crear frame DATA con número de secuencia
-                frame = Frame("DATA", self.seq_num, 0, packet)
+                # Seguro de reutilizar: el frame de este seq ya fue confirmado y
+                # la capa física transmite siempre una copia
+                frame = self._data_frames[self.seq_num]
+                frame.packet = packet
                 
                 # Guardar para posible reenvío
                 self.last_frame_sent = frame
@@ -53,7 +73,7 @@ class PARProtocol(ProtocolInterface):
                 # Programar timeout
                 self._schedule_timeout(simulator)
                 
-                print(f"[PAR-{self.machine_id}] Enviando frame seq={self.seq_num}")
+                log.debug("[PAR-%s] Enviando frame seq=%s", self.machine_id, self.seq_num)
                 
                 return {
                     'action': 'send_frame',
@@ -61,88 +81,92 @@ class PARProtocol(ProtocolInterface):
                     'destination': destination
                 }
         
-        return {'action': 'no_action'}
+        return NO_ACTION
 
     def handle_frame_arrival(self, frame) -> dict:
-        # Decide qué hacer con un frame recibido.
-        
-        if frame.type == "DATA":
-            # Frame de datos recibido
-            if frame.seq_num == self.expected_seq:
-                # Secuencia correcta - entregar y enviar ACK
-                print(f"[PAR-{self.machine_id}] Frame seq={frame.seq_num} correcto, enviando ACK")
-                
-                # Actualizar secuencia esperada
-                self.expected_seq = 1 - self.expected_seq  # Alternar entre 0 y 1
+        # Decide qué hacer con un frame recibido (despacho por tipo de frame)
+        return self._arrival_dispatch[frame.type](frame)
+
+    def _handle_data_frame(self, frame) -> dict:
+        # Frame de datos recibido
+        if frame.seq_num == self.expected_seq:
+            # Secuencia correcta - entregar y enviar ACK
+            log.debug("[PAR-%s] Frame seq=%s correcto, enviando ACK", self.machine_id, frame.seq_num)
+            
+            # Actualizar secuencia esperada
+            self.expected_seq ^= 1  # Alternar entre 0 y 1
+            
+            return {
+                'action': 'deliver_and_ack',
+                'packets': [frame.packet],
+                'ack_seq': frame.seq_num
+            }
+        else:
+            # Verificar si es frame duplicado (secuencia anterior)
+            previous_seq = self.expected_seq ^ 1
+            if frame.seq_num == previous_seq:
+                # Frame duplicado - reenviar ACK sin entregar paquete
+                log.debug("[PAR-%s] Frame seq=%s duplicado (esperaba %s), reenviando ACK", self.machine_id, frame.seq_num, self.expected_seq)
                 
                 return {
-                    'action': 'deliver_packet_and_send_ack',
-                    'packet': frame.packet,
+                    'action': 'deliver_and_ack',
+                    'packets': [],
                     'ack_seq': frame.seq_num
                 }
             else:
-                # Verificar si es frame duplicado (secuencia anterior)
-                previous_seq = 1 - self.expected_seq
-                if frame.seq_num == previous_seq:
-                    # Frame duplicado - reenviar ACK sin entregar paquete
-                    print(f"[PAR-{self.machine_id}] Frame seq={frame.seq_num} duplicado (esperaba {self.expected_seq}), reenviando ACK")
-                    
-                    return {
-                        'action': 'send_ack_only',
-                        'ack_seq': frame.seq_num
-                    }
-                else:
-                    # Secuencia incorrecta - enviar NAK
-                    print(f"[PAR-{self.machine_id}] Frame seq={frame.seq_num} incorrecto (esperaba {self.expected_seq}), enviando NAK")
-                    
-                    return {
-                        'action': 'send_nak',
-                        'nak_seq': self.expected_seq
-                    }
-        
-        elif frame.type == "ACK":
-            # ACK recibido
-            if self.waiting_for_ack and frame.ack_num == self.seq_num:
-                # ACK correcto - avanzar secuencia
-                print(f"[PAR-{self.machine_id}] ACK seq={frame.ack_num} recibido correctamente")
+                # Secuencia incorrecta - enviar NAK
+                log.debug("[PAR-%s] Frame seq=%s incorrecto (esperaba %s), enviando NAK", self.machine_id, frame.seq_num, self.expected_seq)
                 
-                self.seq_num = 1 - self.seq_num  # Alternar entre 0 y 1
-                self.waiting_for_ack = False
-                self.timeout_event_scheduled = False  # Marcar timeout como no activo
-                
-                return {'action': 'continue_sending'}
-            else:
-                # ACK incorrecto o no esperado
-                print(f"[PAR-{self.machine_id}] ACK seq={frame.ack_num} incorrecto o no esperado")
-                return {'action': 'no_action'}
-        
-        elif frame.type == "NAK":
-            # NAK recibido - reenviar
-            if self.waiting_for_ack:
-                print(f"[PAR-{self.machine_id}] NAK recibido, reenviando frame")
-                return {'action': 'retransmit'}
-            else:
-                print(f"[PAR-{self.machine_id}] NAK recibido pero no esperado")
-                return {'action': 'no_action'}
-        
-        return {'action': 'no_action'}
+                return {
+                    'action': 'send_nak',
+                    'nak_seq': self.expected_seq
+                }
+
+    def _handle_ack_frame(self, frame) -> dict:
+        # ACK recibido
+        if self.waiting_for_ack and frame.ack_num == self.seq_num:
+            # ACK correcto - avanzar secuencia
+            log.debug("[PAR-%s] ACK seq=%s recibido correctamente", self.machine_id, frame.ack_num)
+            
+            self.seq_num ^= 1  # Alternar entre 0 y 1
+            self.waiting_for_ack = False
+            self.timer_deadline = None  # Detener timer (el evento en cola se ignorará)
+            
+            return CONTINUE_SENDING
+        else:
+            # ACK incorrecto o no esperado
+            log.debug("[PAR-%s] ACK seq=%s incorrecto o no esperado", self.machine_id, frame.ack_num)
+            return NO_ACTION
+
+    def _handle_nak_frame(self, frame) -> dict:
+        # NAK recibido - reenviar
+        if self.waiting_for_ack:
+            log.debug("[PAR-%s] NAK recibido, reenviando frame", self.machine_id)
+            return {'action': 'retransmit'}
+        else:
+            log.debug("[PAR-%s] NAK recibido pero no esperado", self.machine_id)
+            return NO_ACTION
 
     def handle_frame_corruption(self, frame) -> dict:
         # Decide qué hacer con un frame corrupto
-        print(f"[PAR-{self.machine_id}] Frame corrupto recibido")
+        log.debug("[PAR-%s] Frame corrupto recibido", self.machine_id)
         
         # En PAR, frame corrupto se trata como no recibido
         # Si esperábamos un DATA, no enviamos nada (timeout se encargará)
         # Si esperábamos un ACK, timeout se encargará del reenvío
-        return {'action': 'no_action'}
+        return NO_ACTION
 
     def handle_timeout(self, simulator) -> dict:
         """Maneja evento de timeout."""
-        if self.waiting_for_ack and self.last_frame_sent:
-            print(f"[PAR-{self.machine_id}] TIMEOUT - Reenviando frame seq={self.last_frame_sent.seq_num}")
-            
-            # Resetear flag de timeout antes de programar uno nuevo
-            self.timeout_event_scheduled = False
+        self.timeout_event_scheduled = False
+
+        if self.waiting_for_ack and self.last_frame_sent and self.timer_deadline is not None:
+            if simulator.get_current_time() < self.timer_deadline:
+                # El evento pertenece a un frame anterior: re-armar para el vigente
+                self._arm_timeout_event(simulator)
+                return NO_ACTION
+
+            log.debug("[PAR-%s] TIMEOUT - Reenviando frame seq=%s", self.machine_id, self.last_frame_sent.seq_num)
             
             # Reprogramar nuevo timeout
             self._schedule_timeout(simulator)
@@ -154,21 +178,27 @@ class PARProtocol(ProtocolInterface):
             }
         else:
             # Timeout ya no es necesario (ACK fue recibido)
-            print(f"[PAR-{self.machine_id}] TIMEOUT ignorado - ACK ya fue recibido")
+            log.debug("[PAR-%s] TIMEOUT ignorado - ACK ya fue recibido", self.machine_id)
             
-        return {'action': 'no_action'}
+        return NO_ACTION
 
     def _schedule_timeout(self, simulator):
-        # Programa un evento de timeout
+        # Programa (o reinicia) el timeout del frame en espera
+        self.timer_deadline = simulator.get_current_time() + self.timeout_duration
+        self._arm_timeout_event(simulator)
+        log.debug("[PAR-%s] Timeout programado en %ss", self.machine_id, self.timeout_duration)
+
+    def events_cancelled(self) -> None:
+        # El evento TIMEOUT reutilizable salió de la cola: permitir re-encolarlo
+        self.timeout_event_scheduled = False
+
+    def _arm_timeout_event(self, simulator):
+        # Encola el evento TIMEOUT reutilizable si no está ya en la cola; si
+        # se dispara antes de timer_deadline, handle_timeout lo vuelve a encolar
         if not self.timeout_event_scheduled:
-            timeout_event = Event(
-                EventType.TIMEOUT,
-                simulator.get_current_time() + self.timeout_duration,
-                self.machine_id
-            )
-            simulator.schedule_event(timeout_event)
+            self._timeout_event.timestamp = self.timer_deadline
+            simulator.schedule_event(self._timeout_event)
             self.timeout_event_scheduled = True
-            print(f"[PAR-{self.machine_id}] Timeout programado en {self.timeout_duration}s")
 
     def get_stats(self) -> dict:
         # Retorna estadísticas del protocolo
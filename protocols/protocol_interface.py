@@ -3,12 +3,28 @@ Interfaz base para todos los protocolos de red.
 Todos los protocolos deben heredar de esta clase e implementar sus métodos.
 """
 
-from abc import ABC, abstractmethod
+from __future__ import annotations
+
+from types import MappingProxyType
 from typing import Dict, Any
 
 
-class ProtocolInterface(ABC):
-    """Interfaz base que deben implementar todos los protocolos."""
+# Respuestas constantes compartidas (solo lectura): evitan crear un dict
+# nuevo en cada llamada para las acciones sin parámetros
+NO_ACTION = MappingProxyType({'action': 'no_action'})
+CONTINUE_SENDING = MappingProxyType({'action': 'continue_sending'})
+
+
+class ProtocolInterface:
+    """
+    Interfaz base que deben implementar todos los protocolos.
+
+    Clase simple (sin ABCMeta): los métodos obligatorios lanzan
+    NotImplementedError si la subclase no los redefine.
+    """
+
+    # Las subclases que declaren __slots__ quedan sin __dict__ por instancia
+    __slots__ = ('machine_id',)
     
     def __init__(self, machine_id: str):
         """
@@ -19,7 +35,6 @@ class ProtocolInterface(ABC):
         """
         self.machine_id = machine_id
     
-    @abstractmethod
     def handle_network_layer_ready(self, network_layer, data_link_layer, simulator) -> Dict[str, Any]:
         """
         Maneja cuando Network Layer tiene datos listos para enviar.
@@ -32,9 +47,8 @@ class ProtocolInterface(ABC):
         Returns:
             Dict con la acción a realizar y parámetros necesarios
         """
-        pass
+        raise NotImplementedError
     
-    @abstractmethod
     def handle_frame_arrival(self, frame) -> Dict[str, Any]:
         """
         Maneja la llegada de un frame válido.
@@ -45,9 +59,8 @@ class ProtocolInterface(ABC):
         Returns:
             Dict con la acción a realizar y parámetros necesarios
         """
-        pass
+        raise NotImplementedError
     
-    @abstractmethod
     def handle_frame_corruption(self, frame) -> Dict[str, Any]:
         """
         Maneja un frame corrupto.
@@ -58,7 +71,7 @@ class ProtocolInterface(ABC):
         Returns:
             Dict con la acción a realizar y parámetros necesarios
         """
-        pass
+        raise NotImplementedError
     
     def handle_timeout(self, simulator) -> Dict[str, Any]:
         """
@@ -70,7 +83,30 @@ class ProtocolInterface(ABC):
         Returns:
             Dict con la acción a realizar y parámetros necesarios
         """
-        return {'action': 'no_action'}
+        return NO_ACTION
+    
+    def restart_timer(self, simulator) -> None:
+        """
+        Reinicia el timer de retransmisión (opcional para protocolos sin timeouts).
+        
+        La capa de enlace lo invoca cuando la respuesta del protocolo incluye
+        'restart_timer': True, ya que handle_frame_arrival no recibe el simulador.
+        
+        Args:
+            simulator: Referencia al simulador
+        """
+        pass
+    
+    def events_cancelled(self) -> None:
+        """
+        Aviso de que se cancelaron los eventos pendientes de la máquina
+        (Simulator.cancel_machine_events).
+        
+        Los protocolos que reutilizan un evento TIMEOUT deben olvidar que
+        está en la cola; si no, nunca lo vuelven a encolar y el timer queda
+        muerto.
+        """
+        pass
     
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -84,7 +120,6 @@ class ProtocolInterface(ABC):
             'machine_id': self.machine_id
         }
     
-    @abstractmethod
     def get_protocol_name(self) -> str:
         """
         Obtiene el nombre del protocolo.
@@ -92,4 +127,4 @@ class ProtocolInterface(ABC):
         Returns:
             Nombre del protocolo
         """
-        pass
\ No newline at end of file
+        raise NotImplementedError
\ No newline at end of file
@@ -7,15 +7,48 @@ Protocolo Selective Repeat (Repetición Selectiva)
 - Timeouts independientes por frame
 """
 
-from models.frame import Frame
-from models.events import Event, EventType
-from protocols.protocol_interface import ProtocolInterface
-from typing import Dict, Optional, List
+import logging
+from types import MappingProxyType
+
+from models.frame import Frame, FrameType
+from models.events import Event, EventType, TIMEOUT_SUPERSEDED
+from protocols.protocol_interface import ProtocolInterface, NO_ACTION, CONTINUE_SENDING
+
+log = logging.getLogger(__name__)
+
+# Estimación adaptativa del timeout (RFC 6298): RTO = SRTT + max(G, 4*RTTVAR)
+_RTT_ALPHA = 0.125        # Peso de la muestra nueva en SRTT
+_RTT_BETA = 0.25          # Peso de la muestra nueva en RTTVAR
+_CLOCK_GRANULARITY = 0.1  # Paso mínimo de tiempo del simulador (G)
+_MIN_TIMEOUT = 1.0
+_MAX_TIMEOUT = 60.0
+
+# ACK con muestra de RTT válida: la capa de enlace llama a restart_timer con el
+# simulador (handle_frame_arrival no lo recibe) y ahí se mide el RTT
+_CONTINUE_SAMPLE_RTT = MappingProxyType({'action': 'continue_sending', 'restart_timer': True})
+_SAMPLE_RTT = MappingProxyType({'action': 'no_action', 'restart_timer': True})
 
 
 class SelectiveRepeatProtocol(ProtocolInterface):
     """Protocolo Selective Repeat con ventanas deslizantes bidireccionales."""
 
+    # Atributos reportados tal cual por get_stats (definidos una sola vez por clase)
+    _STATS_KEYS = (
+        'window_size', 'send_base', 'next_seq_num', 'rcv_base',
+        'frames_sent', 'frames_received', 'retransmissions', 'out_of_order_frames',
+        'srtt', 'timeout_duration',
+    )
+
+    # Atributos fijos: sin __dict__ por instancia, acceso por slot
+    __slots__ = (
+        'window_size', 'max_seq_num', '_next_seq', '_full_mask', '_data_frames',
+        'send_base', 'next_seq_num', 'send_window', 'send_deadlines', 'send_times', 'send_count', 'send_mask',
+        '_window_masks', 'rcv_base', 'rcv_window_mask', 'receive_window', 'arrived_mask',
+        'timeout_duration', 'srtt', 'rttvar', '_rtt_sent_at',
+        'timeout_event_scheduled', '_timeout_event', '_arrival_dispatch',
+        'frames_sent', 'frames_received', 'retransmissions', 'out_of_order_frames',
+    )
+
     def __init__(self, machine_id: str, window_size: int = 4):
         """
         Inicializa el protocolo Selective Repeat.
@@ -29,21 +62,35 @@ class SelectiveRepeatProtocol(ProtocolInterface):
         # Configuración de ventanas
         self.window_size = window_size
         self.max_seq_num = 2 * window_size  # Espacio de secuencia debe ser >= 2*N
+        self._build_seq_tables()
         
         # Ventana de envío
         self.send_base = 0  # Primer frame no confirmado
         self.next_seq_num = 0  # Próximo número de secuencia a usar
-        self.send_window = {}  # {seq_num: {'frame': Frame, 'destination': str, 'timer_id': int}}
+        # Arrays paralelos por seq_num (el frame es _data_frames[seq_num]):
+        self.send_window = [None] * self.max_seq_num  # Destino del frame pendiente o None (slot libre)
+        self.send_deadlines = [0.0] * self.max_seq_num  # Vencimiento del frame pendiente
+        self.send_times = [0.0] * self.max_seq_num  # Instante del primer envío (-1.0 si se retransmitió)
+        self.send_count = 0  # Frames sin confirmar en send_window
+        self.send_mask = 0  # Bit k encendido = send_window[k] está ocupado
         
         # Ventana de recepción
         self.rcv_base = 0  # Número de secuencia esperado más bajo
-        self.receive_window = {}  # {seq_num: Frame} - frames recibidos fuera de orden
-        self.ack_sent = set()  # ACKs ya enviados para frames recibidos
+        self.rcv_window_mask = self._window_masks[0]  # Bit k encendido = k en [rcv_base, rcv_base + N)
+        self.receive_window = [None] * self.max_seq_num  # Slot por seq_num: Frame fuera de orden o None
+        self.arrived_mask = 0  # Bit k encendido = receive_window[k] tiene un frame
         
-        # Control de timeouts
-        self.timeout_duration = 3.0
-        self.next_timer_id = 0
-        self.active_timers = {}  # {timer_id: seq_num}
+        # Control de timeouts: cada frame guarda su vencimiento, pero en la cola
+        # hay un único evento TIMEOUT, armado para el vencimiento más próximo
+        self.timeout_duration = 3.0  # Valor inicial, ajustado con cada muestra de RTT
+        self.srtt = None  # RTT suavizado (None hasta la primera muestra)
+        self.rttvar = 0.0  # Variación del RTT
+        self._rtt_sent_at = None  # Envío del frame recién confirmado, medido en restart_timer
+        self.timeout_event_scheduled = False  # El evento está en la cola
+        self._timeout_event = Event(EventType.TIMEOUT, 0.0, machine_id)
+
+        # Manejador por tipo de frame, indexado por FrameType (DATA, ACK, NAK)
+        self._arrival_dispatch = (self._handle_data_frame, self._handle_ack_frame, self._ignore_frame)
         
         # Estadísticas
         self.frames_sent = 0
@@ -56,235 +103,323 @@ class SelectiveRepeatProtocol(ProtocolInterface):
         
         # Verificar si hay espacio en la ventana de envío
         if self._send_window_full():
-            print(f"[SR-{self.machine_id}] Ventana de envío llena, no se pueden enviar más frames")
-            return {'action': 'no_action'}
+            log.debug("[SR-%s] Ventana de envío llena, no se pueden enviar más frames", self.machine_id)
+            return NO_ACTION
         
-        if network_layer.has_data_ready():
+        # Llenar la ventana en una sola llamada con todo lo que haya en cola
+        now = simulator.get_current_time()
+        deadline = now + self.timeout_duration
+        frames = []
+        # La ventana se mide desde send_base, no por frames sin confirmar: tras
+        # ACKs fuera de orden hay slots libres dentro de [send_base, next_seq_num)
+        # que no habilitan números de secuencia más allá de send_base + N
+        outstanding = (self.next_seq_num - self.send_base) % self.max_seq_num
+        while outstanding < self.window_size and network_layer.has_data_ready():
             packet, destination = network_layer.get_packet()
-            if packet and destination:
-                # Crear frame DATA con número de secuencia
-                frame = Frame("DATA", self.next_seq_num, 0, packet)
-                
-                # Agregar a ventana de envío
-                timer_id = self._get_next_timer_id()
-                self.send_window[self.next_seq_num] = {
-                    'frame': frame,
-                    'destination': destination,
-                    'timer_id': timer_id
-                }
-                
-                # Programar timeout para este frame
-                self._schedule_timeout(simulator, self.next_seq_num, timer_id)
-                
-                print(f"[SR-{self.machine_id}] Enviando frame seq={self.next_seq_num} (ventana: {self.send_base}-{(self.send_base + self.window_size - 1) % self.max_seq_num})")
-                
-                # Avanzar número de secuencia
-                self.next_seq_num = (self.next_seq_num + 1) % self.max_seq_num
-                self.frames_sent += 1
-                
-                return {
-                    'action': 'send_frame',
-                    'frame': frame,
-                    'destination': destination
-                }
+            if not (packet and destination):
+                break
+            
+            # Reutilizar el frame DATA del slot: el slot solo se libera tras el
+            # ACK y la capa física transmite una copia, así que es seguro
+            frame = self._data_frames[self.next_seq_num]
+            frame.packet = packet
+            
+            # Agregar a ventana de envío
+            self.send_window[self.next_seq_num] = destination
+            self.send_deadlines[self.next_seq_num] = deadline
+            self.send_times[self.next_seq_num] = now
+            self.send_mask |= 1 << self.next_seq_num
+            self.send_count += 1
+            
+            if log.isEnabledFor(logging.DEBUG):  # Evita calcular el fin de ventana si no se muestra
+                log.debug("[SR-%s] Enviando frame seq=%s (ventana: %s-%s)", self.machine_id, self.next_seq_num, self.send_base, (self.send_base + self.window_size - 1) % self.max_seq_num)
+            
+            # Avanzar número de secuencia
+            self.next_seq_num = self._next_seq[self.next_seq_num]
+            outstanding += 1
+            self.frames_sent += 1
+            frames.append({'frame': frame, 'destination': destination})
+        
+        if not frames:
+            return NO_ACTION
         
-        return {'action': 'no_action'}
+        # Programar timeout (si ya hay evento en la cola y vence después, por
+        # ejemplo porque el RTO se acortó, se adelanta a este vencimiento)
+        self._arm_timeout_event(simulator, deadline)
+        
+        if len(frames) == 1:
+            return {'action': 'send_frame', **frames[0]}
+        return {'action': 'send_multiple_frames', 'frames': frames}
 
     def handle_frame_arrival(self, frame) -> dict:
         """Maneja la llegada de un frame válido."""
-        
-        if frame.type == "DATA":
-            return self._handle_data_frame(frame)
-        elif frame.type == "ACK":
-            return self._handle_ack_frame(frame)
-        
-        return {'action': 'no_action'}
+        # Despacho por tipo: una indexación en lugar de comparaciones encadenadas
+        return self._arrival_dispatch[frame.type](frame)
 
     def _handle_data_frame(self, frame) -> dict:
         """Maneja la llegada de un frame DATA."""
         seq_num = frame.seq_num
         self.frames_received += 1
         
-        print(f"[SR-{self.machine_id}] Frame DATA seq={seq_num} recibido (ventana rcv: {self.rcv_base}-{(self.rcv_base + self.window_size - 1) % self.max_seq_num})")
+        if log.isEnabledFor(logging.DEBUG):  # Evita calcular el fin de ventana si no se muestra
+            log.debug("[SR-%s] Frame DATA seq=%s recibido (ventana rcv: %s-%s)", self.machine_id, seq_num, self.rcv_base, (self.rcv_base + self.window_size - 1) % self.max_seq_num)
         
-        # Siempre enviar ACK para el frame recibido
-        ack_response = {
-            'action': 'send_ack_individual',
-            'ack_seq': seq_num
-        }
+        packets_to_deliver = []  # Sin entrega: solo ACK (fuera de orden o de ventana)
         
         # Verificar si está dentro de la ventana de recepción
         if self._in_receive_window(seq_num):
             if seq_num == self.rcv_base:
                 # Frame esperado - entregar inmediatamente
-                packets_to_deliver = [frame.packet]
-                self.rcv_base = (self.rcv_base + 1) % self.max_seq_num
-                
-                # Verificar frames buffereados consecutivos
-                while self.rcv_base in self.receive_window:
-                    buffered_frame = self.receive_window.pop(self.rcv_base)
-                    packets_to_deliver.append(buffered_frame.packet)
-                    self.rcv_base = (self.rcv_base + 1) % self.max_seq_num
+                packets_to_deliver.append(frame.packet)
+                rcv_base = self._next_seq[seq_num]
                 
-                print(f"[SR-{self.machine_id}] Entregando {len(packets_to_deliver)} paquete(s), nueva base rcv: {self.rcv_base}")
+                # Entregar en bloque los frames buffereados consecutivos
+                if self.arrived_mask:
+                    rcv_base = self._drain_buffered(rcv_base, packets_to_deliver)
+                self.rcv_base = rcv_base
+                self.rcv_window_mask = self._window_masks[rcv_base]
                 
-                return {
-                    'action': 'deliver_packets_and_send_ack',
-                    'packets': packets_to_deliver,
-                    'ack_seq': seq_num
-                }
+                log.debug("[SR-%s] Entregando %s paquete(s), nueva base rcv: %s", self.machine_id, len(packets_to_deliver), self.rcv_base)
             else:
-                # Frame fuera de orden - bufferear
+                # Frame fuera de orden - bufferear (un duplicado reemplaza al anterior)
                 self.receive_window[seq_num] = frame
+                self.arrived_mask |= 1 << seq_num
                 self.out_of_order_frames += 1
-                print(f"[SR-{self.machine_id}] Frame seq={seq_num} buffereado (fuera de orden)")
-                
-                return ack_response
-        else:
-            # Frame fuera de ventana
+                log.debug("[SR-%s] Frame seq=%s buffereado (fuera de orden)", self.machine_id, seq_num)
+        elif log.isEnabledFor(logging.DEBUG):
+            # Frame fuera de ventana: el caso solo se distingue para la traza
             if self._already_received(seq_num):
-                print(f"[SR-{self.machine_id}] Frame seq={seq_num} ya recibido (reenviar ACK)")
+                log.debug("[SR-%s] Frame seq=%s ya recibido (reenviar ACK)", self.machine_id, seq_num)
             else:
-                print(f"[SR-{self.machine_id}] Frame seq={seq_num} fuera de ventana (ignorar)")
-            
-            return ack_response
+                log.debug("[SR-%s] Frame seq=%s fuera de ventana (ignorar)", self.machine_id, seq_num)
+        
+        # Siempre enviar ACK para el frame recibido (una sola respuesta por llegada)
+        return {
+            'action': 'deliver_and_ack',
+            'packets': packets_to_deliver,
+            'ack_seq': seq_num
+        }
 
     def _handle_ack_frame(self, frame) -> dict:
         """Maneja la llegada de un frame ACK."""
         ack_seq = frame.ack_num
         
-        print(f"[SR-{self.machine_id}] ACK seq={ack_seq} recibido")
+        log.debug("[SR-%s] ACK seq=%s recibido", self.machine_id, ack_seq)
         
         # Verificar si el ACK corresponde a un frame en la ventana de envío
-        if ack_seq in self.send_window:
-            # Cancelar timeout y remover de ventana
-            frame_info = self.send_window.pop(ack_seq)
-            self._cancel_timeout(frame_info['timer_id'])
+        # (bit de send_mask: cubre fuera de ventana y ya confirmado)
+        if (self.send_mask >> ack_seq) & 1:
+            # Remover de ventana (su vencimiento deja de contar para el timer)
+            self.send_window[ack_seq] = None
+            self.send_mask &= ~(1 << ack_seq)
+            self.send_count -= 1
+            
+            log.debug("[SR-%s] ACK seq=%s confirmado", self.machine_id, ack_seq)
             
-            print(f"[SR-{self.machine_id}] ACK seq={ack_seq} confirmado")
+            # Algoritmo de Karn: solo frames no retransmitidos dan una muestra válida
+            sent_at = self.send_times[ack_seq]
+            sample_rtt = sent_at >= 0.0
+            if sample_rtt:
+                self._rtt_sent_at = sent_at
             
             # Si es el frame base, avanzar ventana
             if ack_seq == self.send_base:
                 old_base = self.send_base
-                # Avanzar base hasta el próximo frame no confirmado
-                while self.send_base not in self.send_window and not self._send_window_empty():
-                    self.send_base = (self.send_base + 1) % self.max_seq_num
-                
-                # Si ventana está vacía, avanzar base al próximo a enviar
-                if self._send_window_empty():
+                next_base = self._next_seq[old_base]
+                if self.send_count == 0:
+                    # Ventana vacía: la base pasa al próximo a enviar
                     self.send_base = self.next_seq_num
+                elif (self.send_mask >> next_base) & 1:
+                    # ACKs en orden (caso común): el siguiente slot sigue pendiente
+                    self.send_base = next_base
+                else:
+                    # Avanzar base hasta el próximo frame no confirmado: rotar
+                    # send_mask para que la base quede en el bit 0 y contar los
+                    # ceros finales (posición del bit ocupado más bajo)
+                    n = self.max_seq_num
+                    mask = self.send_mask
+                    rotated = ((mask >> old_base) | (mask << (n - old_base))) & self._full_mask
+                    base = old_base + (rotated & -rotated).bit_length() - 1
+                    self.send_base = base - n if base >= n else base
                 
-                print(f"[SR-{self.machine_id}] Ventana de envío avanzada: {old_base} -> {self.send_base}")
+                log.debug("[SR-%s] Ventana de envío avanzada: %s -> %s", self.machine_id, old_base, self.send_base)
                 
                 # Intentar enviar más datos si hay
-                return {'action': 'continue_sending'}
-        else:
-            print(f"[SR-{self.machine_id}] ACK seq={ack_seq} fuera de ventana o duplicado")
+                return _CONTINUE_SAMPLE_RTT if sample_rtt else CONTINUE_SENDING
+            return _SAMPLE_RTT if sample_rtt else NO_ACTION
         
-        return {'action': 'no_action'}
+        log.debug("[SR-%s] ACK seq=%s fuera de ventana o duplicado", self.machine_id, ack_seq)
+        return NO_ACTION
+
+    def _ignore_frame(self, frame) -> dict:
+        """Tipos de frame que Selective Repeat no usa (NAK)."""
+        return NO_ACTION
 
     def handle_frame_corruption(self, frame) -> dict:
         """Maneja un frame corrupto."""
-        print(f"[SR-{self.machine_id}] Frame corrupto recibido - ignorando")
+        log.debug("[SR-%s] Frame corrupto recibido - ignorando", self.machine_id)
         # En Selective Repeat, frames corruptos se ignoran
         # El timeout se encargará del reenvío si era un DATA
         # Si era un ACK, el emisor reenviará por timeout
-        return {'action': 'no_action'}
+        return NO_ACTION
 
     def handle_timeout(self, simulator) -> dict:
-        """Maneja eventos de timeout."""
-        # El timeout viene con el timer_id en los datos del evento
-        # Necesitamos implementar esto en el simulador para pasar el timer_id
-        return {'action': 'no_action'}
-    
-    def handle_timeout_for_frame(self, timer_id: int, simulator) -> dict:
-        """Maneja timeout para un frame específico."""
-        if timer_id in self.active_timers:
-            seq_num = self.active_timers.pop(timer_id)
-            
-            if seq_num in self.send_window:
-                frame_info = self.send_window[seq_num]
-                
-                print(f"[SR-{self.machine_id}] TIMEOUT - Reenviando frame seq={seq_num}")
-                self.retransmissions += 1
-                
-                # Reprogramar timeout
-                new_timer_id = self._get_next_timer_id()
-                frame_info['timer_id'] = new_timer_id
-                self._schedule_timeout(simulator, seq_num, new_timer_id)
-                
-                return {
-                    'action': 'send_frame',
-                    'frame': frame_info['frame'],
-                    'destination': frame_info['destination']
-                }
-        
-        return {'action': 'no_action'}
+        """Reenvía los frames cuyo vencimiento ya pasó y re-arma el timer."""
+        self.timeout_event_scheduled = False
+        now = simulator.get_current_time()
+        deadlines = self.send_deadlines
+        new_deadline = None  # Se calcula al encontrar el primer frame vencido
+
+        frames = []
+        earliest = None  # Próximo vencimiento entre los frames pendientes
+        for seq_num, destination in enumerate(self.send_window):
+            if destination is None:
+                continue
+            if deadlines[seq_num] <= now:
+                if new_deadline is None:
+                    if self.srtt is None:
+                        # Sin muestras todavía el timeout inicial puede ser menor que
+                        # el RTT (y Karn descarta todo lo retransmitido): duplicarlo.
+                        # Con SRTT ya medido, un vencimiento es pérdida, no RTO corto
+                        self.timeout_duration = min(2 * self.timeout_duration, _MAX_TIMEOUT)
+                    new_deadline = now + self.timeout_duration
+                log.debug("[SR-%s] TIMEOUT - Reenviando frame seq=%s", self.machine_id, seq_num)
+                deadlines[seq_num] = new_deadline
+                self.send_times[seq_num] = -1.0  # El ACK ya no identifica qué envío confirma
+                frames.append({'frame': self._data_frames[seq_num], 'destination': destination})
+            if earliest is None or deadlines[seq_num] < earliest:
+                earliest = deadlines[seq_num]
+
+        if earliest is not None:
+            self._arm_timeout_event(simulator, earliest)
+
+        if not frames:
+            # ACK recibido antes del vencimiento: nada que reenviar
+            return NO_ACTION
+
+        self.retransmissions += len(frames)
+        if len(frames) == 1:
+            return {'action': 'send_frame', **frames[0]}
+        return {'action': 'send_multiple_frames', 'frames': frames}
+
+    def restart_timer(self, simulator) -> None:
+        """Toma la muestra de RTT del último ACK con el reloj del simulador."""
+        sent_at = self._rtt_sent_at
+        if sent_at is not None:
+            self._rtt_sent_at = None
+            self._update_timeout(simulator.get_current_time() - sent_at)
+
+    def _update_timeout(self, rtt: float):
+        """Actualiza SRTT/RTTVAR con una muestra de RTT y recalcula el timeout."""
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar += _RTT_BETA * (abs(self.srtt - rtt) - self.rttvar)
+            self.srtt += _RTT_ALPHA * (rtt - self.srtt)
+        timeout = self.srtt + max(_CLOCK_GRANULARITY, 4 * self.rttvar)
+        self.timeout_duration = min(max(timeout, _MIN_TIMEOUT), _MAX_TIMEOUT)
+        log.debug("[SR-%s] RTT=%s → timeout=%s", self.machine_id, rtt, self.timeout_duration)
+
+    def _drain_buffered(self, start: int, packets: list) -> int:
+        """
+        Extrae de una vez los frames buffereados contiguos desde start.
+
+        Rota arrived_mask para que start quede en el bit 0; la cantidad de
+        unos consecutivos desde ahí es el largo del bloque a entregar, que
+        se copia con slices (partiendo en dos si da la vuelta).
+
+        Returns:
+            Nueva base de recepción (primer número no recibido)
+        """
+        n = self.max_seq_num
+        arrived = self.arrived_mask
+        rotated = ((arrived >> start) | (arrived << (n - start))) & self._full_mask
+        ready = (rotated ^ (rotated + 1)).bit_length() - 1  # Unos consecutivos desde el bit 0
+        if not ready:
+            return start
+
+        window = self.receive_window
+        end = start + ready
+        if end <= n:
+            batch = window[start:end]
+            window[start:end] = [None] * ready
+        else:
+            end -= n
+            batch = window[start:] + window[:end]
+            window[start:] = [None] * (n - start)
+            window[:end] = [None] * end
+        packets.extend(frame.packet for frame in batch)
+
+        run = (1 << ready) - 1
+        self.arrived_mask = arrived & ~((run << start) | (run >> (n - start)))
+        return end if end < n else 0
 
     def _send_window_full(self) -> bool:
         """Verifica si la ventana de envío está llena."""
-        return len(self.send_window) >= self.window_size
+        # Distancia circular desde send_base (los ACKs fuera de orden no la acortan)
+        return (self.next_seq_num - self.send_base) % self.max_seq_num >= self.window_size
 
     def _send_window_empty(self) -> bool:
         """Verifica si la ventana de envío está vacía."""
-        return len(self.send_window) == 0
+        return self.send_count == 0
 
     def _in_receive_window(self, seq_num: int) -> bool:
         """Verifica si un número de secuencia está dentro de la ventana de recepción."""
-        window_end = (self.rcv_base + self.window_size - 1) % self.max_seq_num
-        
-        if self.rcv_base <= window_end:
-            return self.rcv_base <= seq_num <= window_end
-        else:  # Ventana wrapeada
-            return seq_num >= self.rcv_base or seq_num <= window_end
+        # Un bit por número de secuencia (cubre también la ventana wrapeada)
+        return (self.rcv_window_mask >> seq_num) & 1 == 1
 
     def _already_received(self, seq_num: int) -> bool:
         """Verifica si un frame ya fue recibido anteriormente."""
-        # Frame ya recibido si está antes de la base de recepción
-        if self.rcv_base == 0:
-            return seq_num > (self.max_seq_num - self.window_size)
-        else:
-            return seq_num < self.rcv_base and seq_num >= (self.rcv_base - self.window_size) % self.max_seq_num
+        # Frame ya recibido si está en la ventana anterior [rcv_base - N, rcv_base):
+        # con max_seq_num = 2N son justo los números fuera de la ventana actual
+        return (self.rcv_window_mask >> seq_num) & 1 == 0
 
-    def _get_next_timer_id(self) -> int:
-        """Obtiene el próximo ID de timer."""
-        timer_id = self.next_timer_id
-        self.next_timer_id += 1
-        return timer_id
+    def _build_seq_tables(self):
+        """Precalcula la aritmética circular y los frames DATA del espacio de secuencia."""
+        n = self.max_seq_num
+        # Máscara con un bit por número de secuencia (para arrived_mask y send_mask)
+        self._full_mask = (1 << n) - 1
+        # Un frame DATA por número de secuencia (seq_num fijo, se cambia el paquete)
+        self._data_frames = [Frame(FrameType.DATA, k, 0) for k in range(n)]
+        # Sucesor de cada número de secuencia
+        self._next_seq = tuple((k + 1) % n for k in range(n))
+        # Máscara de la ventana de recepción para cada rcv_base posible
+        # (N bits desde base, rotados dentro de los n bits del espacio)
+        run = (1 << self.window_size) - 1
+        self._window_masks = tuple(((run << base) | (run >> (n - base))) & self._full_mask
+                                   for base in range(n))
 
-    def _schedule_timeout(self, simulator, seq_num: int, timer_id: int):
-        """Programa un timeout para un frame específico."""
-        self.active_timers[timer_id] = seq_num
-        
-        timeout_event = Event(
-            EventType.TIMEOUT,
-            simulator.get_current_time() + self.timeout_duration,
-            self.machine_id,
-            {'timer_id': timer_id}  # Pasar timer_id en los datos del evento
-        )
-        simulator.schedule_event(timeout_event)
-
-    def _cancel_timeout(self, timer_id: int):
-        """Cancela un timeout (marcándolo como inactivo)."""
-        if timer_id in self.active_timers:
-            del self.active_timers[timer_id]
+    def events_cancelled(self) -> None:
+        """El evento TIMEOUT reutilizable salió de la cola: permitir re-encolarlo."""
+        self.timeout_event_scheduled = False
+
+    def _arm_timeout_event(self, simulator, deadline: float):
+        """
+        Encola el evento TIMEOUT reutilizable si no está ya en la cola.
+
+        Si ya está encolado pero vence después de `deadline` (el RTO adaptivo
+        se acortó), el evento encolado se marca como reemplazado y se encola
+        uno nuevo para el vencimiento más temprano. No se puede mover el
+        evento encolado: el heap guarda su timestamp en la tupla de entrada.
+        """
+        if not self.timeout_event_scheduled:
+            self._timeout_event.timestamp = deadline
+            simulator.schedule_event(self._timeout_event)
+            self.timeout_event_scheduled = True
+        elif deadline < self._timeout_event.timestamp:
+            self._timeout_event.data = TIMEOUT_SUPERSEDED
+            self._timeout_event = Event(EventType.TIMEOUT, deadline, self.machine_id)
+            simulator.schedule_event(self._timeout_event)
 
     def get_stats(self) -> dict:
         """Retorna estadísticas del protocolo."""
         stats = super().get_stats()
-        stats.update({
-            'window_size': self.window_size,
-            'send_base': self.send_base,
-            'next_seq_num': self.next_seq_num,
-            'rcv_base': self.rcv_base,
-            'send_window_size': len(self.send_window),
-            'receive_buffer_size': len(self.receive_window),
-            'frames_sent': self.frames_sent,
-            'frames_received': self.frames_received,
-            'retransmissions': self.retransmissions,
-            'out_of_order_frames': self.out_of_order_frames,
-            'active_timers': len(self.active_timers)
-        })
+        stats.update({key: getattr(self, key) for key in self._STATS_KEYS})
+        # Valores derivados del estado de las ventanas
+        stats['send_window_size'] = self.send_count
+        stats['receive_buffer_size'] = bin(self.arrived_mask).count('1')
+        stats['active_timers'] = self.send_count  # Un vencimiento por frame pendiente
         return stats
 
     def get_protocol_name(self) -> str:
@@ -293,11 +428,17 @@ class SelectiveRepeatProtocol(ProtocolInterface):
 
     def set_window_size(self, window_size: int):
         """Permite cambiar el tamaño de ventana (solo antes de iniciar)."""
-        if self.send_window or self.receive_window:
-            print(f"[SR-{self.machine_id}] No se puede cambiar tamaño de ventana durante transmisión")
+        if self.send_count or self.arrived_mask:
+            log.warning("[SR-%s] No se puede cambiar tamaño de ventana durante transmisión", self.machine_id)
             return False
         
         self.window_size = window_size
         self.max_seq_num = 2 * window_size
-        print(f"[SR-{self.machine_id}] Tamaño de ventana actualizado a {window_size}")
+        self._build_seq_tables()
+        self.send_window = [None] * self.max_seq_num
+        self.send_deadlines = [0.0] * self.max_seq_num
+        self.send_times = [0.0] * self.max_seq_num
+        self.receive_window = [None] * self.max_seq_num
+        self.rcv_window_mask = self._window_masks[self.rcv_base % self.max_seq_num]
+        log.info("[SR-%s] Tamaño de ventana actualizado a %s", self.machine_id, window_size)
         return True
\ No newline at end of file
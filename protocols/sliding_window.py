@@ -7,14 +7,26 @@ Protocolo Sliding Window de 1 bit (Alternating Bit) - Bidireccional (CLI)
 - Timeout y retransmisión automática
 """
 
-from models.frame import Frame
+import logging
+
+from models.frame import Frame, FrameType
 from models.events import Event, EventType
-from protocols.protocol_interface import ProtocolInterface
+from protocols.protocol_interface import ProtocolInterface, NO_ACTION, CONTINUE_SENDING
+
+log = logging.getLogger(__name__)
 
 
 class SlidingWindow1BitProtocol(ProtocolInterface):
     '''Protocolo Alternating Bit bidireccional'''
 
+    # Atributos fijos: sin __dict__ por instancia, acceso por slot
+    __slots__ = (
+        'next_seq_to_send', 'waiting_for_ack', 'last_send',
+        '_data_frames', 'frame_expected', 'timeout_duration', 'timeout_event_scheduled', 'timer_deadline',
+        '_timeout_event', '_arrival_dispatch',
+        'sent_data', 'received_data', 'acks_sent', 'acks_received', 'duplicates',
+    )
+
     def __init__(self, machine_id: str):
         super().__init__(machine_id)
         self.machine_id = machine_id
@@ -22,15 +34,21 @@ class SlidingWindow1BitProtocol(ProtocolInterface):
         # Estado emisor
         self.next_seq_to_send = 0
         self.waiting_for_ack = False
-        self.last_frame_sent = None
-        self.last_destination = None
+        self.last_send = None  # Respuesta send_frame del DATA en espera (se repite al reenviar)
+        # Un frame DATA por número de secuencia (0/1), reutilizado en cada envío
+        self._data_frames = (Frame(FrameType.DATA, 0, 0), Frame(FrameType.DATA, 1, 0))
 
         # Estado receptor
         self.frame_expected = 0
 
-        # Control de timeout
+        # Control de timeout: un único evento TIMEOUT reutilizado, re-armado en el lugar
         self.timeout_duration = 4.0
-        self.timeout_event_scheduled = False
+        self.timeout_event_scheduled = False  # El evento está en la cola
+        self.timer_deadline = None            # Vencimiento vigente (None = timer detenido)
+        self._timeout_event = Event(EventType.TIMEOUT, 0.0, machine_id)
+
+        # Manejador por tipo de frame, indexado por FrameType (DATA, ACK, NAK)
+        self._arrival_dispatch = (self._handle_data_frame, self._handle_ack_frame, self._ignore_frame)
 
         # Métricas
         self.sent_data = 0
@@ -42,86 +60,108 @@ class SlidingWindow1BitProtocol(ProtocolInterface):
     def handle_network_layer_ready(self, network_layer, data_link_layer, simulator) -> dict:
         """Cuando hay datos listos para enviar desde la capa de red."""
         if self.waiting_for_ack:
-            print(f"[SW1-{self.machine_id}] Esperando ACK del seq={self.next_seq_to_send}, no se envía nuevo DATA")
-            return {'action': 'no_action'}
+            log.debug("[SW1-%s] Esperando ACK del seq=%s, no se envía nuevo DATA", self.machine_id, self.next_seq_to_send)
+            return NO_ACTION
 
         if network_layer.has_data_ready():
             packet, destination = network_layer.get_packet()
             if packet and destination:
-                frame = Frame("DATA", self.next_seq_to_send, 0, packet)
-                print(f"[SW1-{self.machine_id}] Enviando DATA seq={self.next_seq_to_send} → {destination}")
+                # Seguro de reutilizar: el frame de este seq ya fue confirmado y
+                # la capa física transmite siempre una copia
+                frame = self._data_frames[self.next_seq_to_send]
+                frame.packet = packet
+                log.debug("[SW1-%s] Enviando DATA seq=%s → %s", self.machine_id, self.next_seq_to_send, destination)
 
                 self.waiting_for_ack = True
-                self.last_frame_sent = frame
-                self.last_destination = destination
+                self.last_send = {'action': 'send_frame', 'frame': frame, 'destination': destination}
                 self.sent_data += 1
 
                 # Programa timeout
                 self._schedule_timeout(simulator)
 
-                return {'action': 'send_frame', 'frame': frame, 'destination': destination}
+                return self.last_send
 
-        return {'action': 'no_action'}
+        return NO_ACTION
 
     def handle_frame_arrival(self, frame: Frame) -> dict:
         """Procesa llegada de un frame (DATA/ACK)."""
-        if frame.type == "DATA":
-            # Receptor: aceptar solo el esperado
-            if frame.seq_num == self.frame_expected:
-                print(f"[SW1-{self.machine_id}] DATA seq={frame.seq_num} correcto → entregar y ACK")
-                self.received_data += 1
-                self.frame_expected = 1 - self.frame_expected
-                self.acks_sent += 1
-                return {'action': 'deliver_packet_and_send_ack', 'packet': frame.packet, 'ack_seq': frame.seq_num}
-            else:
-                print(f"[SW1-{self.machine_id}] DATA seq={frame.seq_num} duplicado/no esperado → solo ACK")
-                self.duplicates += 1
-                self.acks_sent += 1
-                return {'action': 'send_ack_only', 'ack_seq': frame.seq_num}
-
-        elif frame.type == "ACK":
-            # Emisor: validar ACK
-            if self.waiting_for_ack and frame.ack_num == self.next_seq_to_send:
-                print(f"[SW1-{self.machine_id}] ACK seq={frame.ack_num} recibido → listo para siguiente DATA")
-                self.waiting_for_ack = False
-                self.timeout_event_scheduled = False
-                self.next_seq_to_send = 1 - self.next_seq_to_send
-                self.acks_received += 1
-                return {'action': 'continue_sending'}
-            else:
-                print(f"[SW1-{self.machine_id}] ACK seq={frame.ack_num} inesperado o duplicado → ignorar")
-                return {'action': 'no_action'}
-
-        return {'action': 'no_action'}
+        # Despacho por tipo: una indexación en lugar de comparaciones encadenadas
+        return self._arrival_dispatch[frame.type](frame)
+
+    def _handle_data_frame(self, frame: Frame) -> dict:
+        """Receptor: aceptar solo el esperado."""
+        seq = frame.seq_num
+        self.acks_sent += 1
+        if seq == self.frame_expected:
+            log.debug("[SW1-%s] DATA seq=%s correcto → entregar y ACK", self.machine_id, seq)
+            self.received_data += 1
+            self.frame_expected = seq ^ 1
+            return {'action': 'deliver_and_ack', 'packets': [frame.packet], 'ack_seq': seq}
+
+        log.debug("[SW1-%s] DATA seq=%s duplicado/no esperado → solo ACK", self.machine_id, seq)
+        self.duplicates += 1
+        return {'action': 'deliver_and_ack', 'packets': [], 'ack_seq': seq}
+
+    def _handle_ack_frame(self, frame: Frame) -> dict:
+        """Emisor: validar ACK."""
+        if self.waiting_for_ack and frame.ack_num == self.next_seq_to_send:
+            log.debug("[SW1-%s] ACK seq=%s recibido → listo para siguiente DATA", self.machine_id, frame.ack_num)
+            self.waiting_for_ack = False
+            self.timer_deadline = None  # Detener timer (el evento en cola se ignorará)
+            self.next_seq_to_send ^= 1
+            self.acks_received += 1
+            return CONTINUE_SENDING
+
+        log.debug("[SW1-%s] ACK seq=%s inesperado o duplicado → ignorar", self.machine_id, frame.ack_num)
+        return NO_ACTION
+
+    def _ignore_frame(self, frame: Frame) -> dict:
+        """Tipos de frame que Sliding Window no usa (NAK)."""
+        return NO_ACTION
 
     def handle_frame_corruption(self, frame: Frame) -> dict:
         """Frame corrupto detectado por DataLinkLayer."""
-        print(f"[SW1-{self.machine_id}] Frame corrupto recibido → ignorar")
-        return {'action': 'no_action'}
+        log.debug("[SW1-%s] Frame corrupto recibido → ignorar", self.machine_id)
+        return NO_ACTION
 
     def handle_timeout(self, simulator) -> dict:
         """Maneja evento de timeout"""
-        if self.waiting_for_ack and self.last_frame_sent:
-            print(f"[SW1-{self.machine_id}] TIMEOUT → retransmitir DATA seq={self.last_frame_sent.seq_num}")
-            self.timeout_event_scheduled = False
+        self.timeout_event_scheduled = False
+
+        if self.waiting_for_ack and self.last_send and self.timer_deadline is not None:
+            if simulator.get_current_time() < self.timer_deadline:
+                # El evento pertenece a un frame anterior: re-armar para el vigente
+                self._arm_timeout_event(simulator)
+                return NO_ACTION
+
+            log.debug("[SW1-%s] TIMEOUT → retransmitir DATA seq=%s", self.machine_id, self.next_seq_to_send)
             self._schedule_timeout(simulator)
-            return {'action': 'send_frame', 'frame': self.last_frame_sent, 'destination': self.last_destination}
+            return self.last_send
 
-        print(f"[SW1-{self.machine_id}] TIMEOUT ignorado (ACK ya recibido)")
-        return {'action': 'no_action'}
+        log.debug("[SW1-%s] TIMEOUT ignorado (ACK ya recibido)", self.machine_id)
+        return NO_ACTION
 
     def _schedule_timeout(self, simulator):
-        """Programa un evento de timeout para el emisor"""
+        """Programa (o reinicia) el timeout del frame en espera"""
+        self.timer_deadline = simulator.get_current_time() + self.timeout_duration
+        self._arm_timeout_event(simulator)
+        log.debug("[SW1-%s] Timeout programado en %ss", self.machine_id, self.timeout_duration)
+
+    def events_cancelled(self) -> None:
+        """El evento TIMEOUT reutilizable salió de la cola: permitir re-encolarlo."""
+        self.timeout_event_scheduled = False
+
+    def _arm_timeout_event(self, simulator):
+        """
+        Encola el evento TIMEOUT reutilizable si no está ya en la cola.
+
+        Si se dispara antes de timer_deadline, handle_timeout lo vuelve a
+        encolar; así no se crea un Event por envío ni hay que cancelar nada.
+        """
         if not self.timeout_event_scheduled:
-            timeout_event = Event(
-                EventType.TIMEOUT,
-                simulator.get_current_time() + self.timeout_duration,
-                self.machine_id
-            )
-            simulator.schedule_event(timeout_event)
+            self._timeout_event.timestamp = self.timer_deadline
+            simulator.schedule_event(self._timeout_event)
             self.timeout_event_scheduled = True
-            print(f"[SW1-{self.machine_id}] Timeout programado en {self.timeout_duration}s")
-
 
     def get_stats(self) -> dict:
         stats = super().get_stats()
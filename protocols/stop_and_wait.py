@@ -5,14 +5,21 @@ Protocolo Stop and Wait - Versión básica
 - Números de secuencia alternantes (0,1)
 """
 
-from models.frame import Frame
+import logging
+
+from models.frame import Frame, FrameType
 from models.events import Event, EventType
-from protocols.protocol_interface import ProtocolInterface
+from protocols.protocol_interface import ProtocolInterface, NO_ACTION, CONTINUE_SENDING
+
+log = logging.getLogger(__name__)
 
 
 class StopAndWaitProtocol(ProtocolInterface):
     """Protocolo Stop and Wait básico."""
 
+    # Atributos fijos: sin __dict__ por instancia, acceso por slot
+    __slots__ = ('seq_num', 'expected_seq', 'waiting_for_ack', '_data_frames', '_arrival_dispatch')
+
     def __init__(self, machine_id: str):
         """Inicializa el protocolo Stop and Wait."""
         super().__init__(machine_id)
@@ -21,23 +28,30 @@ class StopAndWaitProtocol(ProtocolInterface):
         self.seq_num = 0  # Número de secuencia actual (0 o 1)
         self.expected_seq = 0  # Secuencia esperada en receptor
         self.waiting_for_ack = False  # ¿Esperando ACK?
+        # Un frame DATA por número de secuencia (0/1), reutilizado en cada envío
+        self._data_frames = (Frame(FrameType.DATA, 0, 0), Frame(FrameType.DATA, 1, 0))
+
+        # Manejador por tipo de frame, indexado por FrameType (DATA, ACK, NAK)
+        self._arrival_dispatch = (self._handle_data_frame, self._handle_ack_frame, self._ignore_frame)
 
     def handle_network_layer_ready(self, network_layer, data_link_layer, simulator) -> dict:
         """Decide qué hacer cuando hay datos listos en Network Layer."""
         
         # Solo procesar si no estamos esperando ACK
         if self.waiting_for_ack:
-            print(f"[StopWait-{self.machine_id}] Esperando ACK, no se pueden enviar más datos")
-            return {'action': 'no_action'}
+            log.debug("[StopWait-%s] Esperando ACK, no se pueden enviar más datos", self.machine_id)
+            return NO_ACTION
         
         if network_layer.has_data_ready():
             packet, destination = network_layer.get_packet()
             if packet and destination:
-                # Crear frame DATA con número de secuencia
-                frame = Frame("DATA", self.seq_num, 0, packet)
+                # Seguro de reutilizar: el frame de este seq ya fue confirmado y
+                # la capa física transmite siempre una copia
+                frame = self._data_frames[self.seq_num]
+                frame.packet = packet
                 self.waiting_for_ack = True
                 
-                print(f"[StopWait-{self.machine_id}] Enviando frame seq={self.seq_num}")
+                log.debug("[StopWait-%s] Enviando frame seq=%s", self.machine_id, self.seq_num)
                 
                 return {
                     'action': 'send_frame',
@@ -45,53 +59,58 @@ class StopAndWaitProtocol(ProtocolInterface):
                     'destination': destination
                 }
         
-        return {'action': 'no_action'}
+        return NO_ACTION
 
     def handle_frame_arrival(self, frame) -> dict:
         """Decide qué hacer con un frame recibido."""
+        # Despacho por tipo: una indexación en lugar de comparaciones encadenadas
+        return self._arrival_dispatch[frame.type](frame)
+
+    def _handle_data_frame(self, frame) -> dict:
+        """Frame de datos recibido - siempre enviar ACK en Stop and Wait básico."""
+        log.debug("[StopWait-%s] Frame seq=%s recibido, enviando ACK", self.machine_id, frame.seq_num)
         
-        if frame.type == "DATA":
-            # Frame de datos recibido - siempre enviar ACK en Stop and Wait básico
-            print(f"[StopWait-{self.machine_id}] Frame seq={frame.seq_num} recibido, enviando ACK")
+        if frame.seq_num == self.expected_seq:
+            # Secuencia correcta - entregar
+            self.expected_seq ^= 1  # Alternar entre 0 y 1
             
-            if frame.seq_num == self.expected_seq:
-                # Secuencia correcta - entregar
-                self.expected_seq = 1 - self.expected_seq  # Alternar entre 0 y 1
-                
-                return {
-                    'action': 'deliver_packet_and_send_ack',
-                    'packet': frame.packet,
-                    'ack_seq': frame.seq_num
-                }
-            else:
-                # Secuencia duplicada - solo ACK (no entregar)
-                return {
-                    'action': 'send_ack_only',
-                    'ack_seq': frame.seq_num
-                }
+            return {
+                'action': 'deliver_and_ack',
+                'packets': [frame.packet],
+                'ack_seq': frame.seq_num
+            }
         
-        elif frame.type == "ACK":
-            # ACK recibido
-            if self.waiting_for_ack and frame.ack_num == self.seq_num:
-                # ACK correcto - avanzar secuencia
-                print(f"[StopWait-{self.machine_id}] ACK seq={frame.ack_num} recibido correctamente")
-                
-                self.seq_num = 1 - self.seq_num  # Alternar entre 0 y 1
-                self.waiting_for_ack = False
-                
-                return {'action': 'continue_sending'}
-            else:
-                # ACK incorrecto o no esperado
-                print(f"[StopWait-{self.machine_id}] ACK seq={frame.ack_num} incorrecto o no esperado")
-                return {'action': 'no_action'}
+        # Secuencia duplicada - solo ACK (no entregar)
+        return {
+            'action': 'deliver_and_ack',
+            'packets': [],
+            'ack_seq': frame.seq_num
+        }
+
+    def _handle_ack_frame(self, frame) -> dict:
+        """ACK recibido."""
+        if self.waiting_for_ack and frame.ack_num == self.seq_num:
+            # ACK correcto - avanzar secuencia
+            log.debug("[StopWait-%s] ACK seq=%s recibido correctamente", self.machine_id, frame.ack_num)
+            
+            self.seq_num ^= 1  # Alternar entre 0 y 1
+            self.waiting_for_ack = False
+            
+            return CONTINUE_SENDING
         
-        return {'action': 'no_action'}
+        # ACK incorrecto o no esperado
+        log.debug("[StopWait-%s] ACK seq=%s incorrecto o no esperado", self.machine_id, frame.ack_num)
+        return NO_ACTION
+
+    def _ignore_frame(self, frame) -> dict:
+        """Tipos de frame que Stop and Wait no usa (NAK)."""
+        return NO_ACTION
 
     def handle_frame_corruption(self, frame) -> dict:
         """Decide qué hacer con un frame corrupto."""
-        print(f"[StopWait-{self.machine_id}] Frame corrupto recibido - ignorando")
+        log.debug("[StopWait-%s] Frame corrupto recibido - ignorando", self.machine_id)
         # Stop and Wait básico: ignorar frames corruptos
-        return {'action': 'no_action'}
+        return NO_ACTION
 
     def get_stats(self) -> dict:
         """Retorna estadísticas del protocolo."""
@@ -3,13 +3,20 @@ Protocolo Utopia - versión simplificada.
 Solo lógica esencial: envío inmediato sin control.
 """
 
-from models.frame import Frame
-from protocols.protocol_interface import ProtocolInterface
+import logging
+
+from models.frame import Frame, FrameType
+from protocols.protocol_interface import ProtocolInterface, NO_ACTION
+
+log = logging.getLogger(__name__)
 
 
 class UtopiaProtocol(ProtocolInterface):
     """Protocolo Utopia - el más simple posible."""
 
+    # Sin estado propio: solo machine_id, declarado en ProtocolInterface
+    __slots__ = ()
+
     def __init__(self, machine_id: str):
         """Inicializa el protocolo Utopia."""
         self.machine_id = machine_id
@@ -20,7 +27,7 @@ class UtopiaProtocol(ProtocolInterface):
             packet, destination = network_layer.get_packet()
             if packet and destination:
                 # Utopia: crear frame y enviar inmediatamente
-                frame = Frame("DATA", 0, 0, packet)
+                frame = Frame(FrameType.DATA, 0, 0, packet)
 
                 return {
                     'action': 'send_frame',
@@ -28,7 +35,7 @@ class UtopiaProtocol(ProtocolInterface):
                     'destination': destination
                 }
 
-        return {'action': 'no_action'}
+        return NO_ACTION
 
     def handle_frame_arrival(self, frame: Frame) -> dict:
         """Decide qué hacer con un frame recibido."""
@@ -39,13 +46,13 @@ class UtopiaProtocol(ProtocolInterface):
                 'packet': frame.packet
             }
 
-        return {'action': 'no_action'}
+        return NO_ACTION
 
     def handle_frame_corruption(self, frame: Frame) -> dict:
         """Decide qué hacer con un frame corrupto."""
         # Utopia: simplemente ignora frames corruptos (no hay errores según requerimientos)
-        print(f"[Protocol-{self.machine_id}] Frame corrupto ignorado (Utopia)")
-        return {'action': 'no_action'}
+        log.debug("[Protocol-%s] Frame corrupto ignorado (Utopia)", self.machine_id)
+        return NO_ACTION
     
     def get_protocol_name(self) -> str:
         """Obtiene el nombre del protocolo."""
@@ -1,35 +1,85 @@
 import heapq
+import itertools
 from models.events import Event
 
 
 class EventScheduler:
     def __init__(self):
-        self._event_queue = []  # Cola de eventos ordenada por tiempo
+        # Cola ordenada por tiempo: tuplas (timestamp, seq, evento), así el heap
+        # compara floats/ints en C en lugar de llamar a Event.__lt__
+        self._event_queue = []
+        self._insertion_counter = itertools.count()  # Desempate FIFO entre eventos simultáneos
+        # Cancelación perezosa: machine_id -> primer seq que sigue vigente.
+        # Los eventos anteriores de esa máquina se descartan al llegar al tope
+        self._cancelled_before = {}
+        self.discarded_events = 0  # Eventos cancelados ya retirados de la cola
 
     def schedule_event(self, event: Event) -> None:
         # Agrega evento a la cola ordenada
-        heapq.heappush(self._event_queue, event)
+        heapq.heappush(self._event_queue, (event.timestamp, next(self._insertion_counter), event))
+
+    def schedule_events(self, events) -> None:
+        # Agrega varios eventos de una vez. Si el lote no es menor que la cola,
+        # extend + heapify (O(n)) sale más barato que un heappush por evento
+        counter = self._insertion_counter
+        queue = self._event_queue
+        entries = []
+        for event in events:
+            entries.append((event.timestamp, next(counter), event))
+        if len(entries) >= len(queue):
+            queue.extend(entries)
+            heapq.heapify(queue)
+        else:
+            for entry in entries:
+                heapq.heappush(queue, entry)
 
     def get_next_event(self):
         # Obtiene el próximo evento cronológicamente
-        return heapq.heappop(self._event_queue) if self._event_queue else None
+        if self._cancelled_before:
+            self._discard_cancelled()
+        return heapq.heappop(self._event_queue)[2] if self._event_queue else None
 
     def has_events(self) -> bool:
         # Verifica si hay eventos pendientes
+        if self._cancelled_before:
+            self._discard_cancelled()
         return bool(self._event_queue)
 
     def peek_next_event(self):
         # Ve el próximo evento sin removerlo
-        return self._event_queue[0] if self._event_queue else None
+        if self._cancelled_before:
+            self._discard_cancelled()
+        return self._event_queue[0][2] if self._event_queue else None
 
     def clear_events(self) -> None:
         # Limpia todos los eventos pendientes
         self._event_queue.clear()
+        self._cancelled_before.clear()
+
+    def _cancel_events_for_machine(self, machine_id: str) -> None:
+        """
+        Cancela todos los eventos ya programados de una máquina en O(1).
+
+        No recorre el heap, solo marca el corte; los eventos cancelados se
+        descartan al llegar al tope (ver discarded_events). Por eso ya no
+        devuelve cuántos eventos canceló: no se conoce sin recorrer la cola.
+
+        Privado: los protocolos que reutilizan su evento TIMEOUT deben
+        enterarse (events_cancelled) o su timer queda muerto. Usar
+        Simulator.cancel_machine_events, que hace ambas cosas.
+        """
+        self._cancelled_before[machine_id] = next(self._insertion_counter)
 
-    def cancel_events_for_machine(self, machine_id: str) -> int:
-        # Cancela todos los eventos de una máquina específica
-        original_count = len(self._event_queue)
-        self._event_queue = [event for event in self._event_queue
-                           if event.machine_id != machine_id]
-        heapq.heapify(self._event_queue)  # Reorganiza el heap
-        return original_count - len(self._event_queue)
\ No newline at end of file
+    def _discard_cancelled(self) -> None:
+        # Retira del tope los eventos programados antes de cancelar su máquina
+        queue = self._event_queue
+        cancelled_before = self._cancelled_before
+        while queue:
+            # El seq vive solo en la tupla: un evento TIMEOUT reutilizado puede
+            # estar en la cola con un seq viejo y otro nuevo a la vez
+            _, seq, head = queue[0]
+            cutoff = cancelled_before.get(head.machine_id)
+            if cutoff is None or seq >= cutoff:
+                return
+            heapq.heappop(queue)
+            self.discarded_events += 1
@@ -2,15 +2,23 @@
 Clase Machine - coordinador principal que maneja todas las capas de red.
 """
 
+import logging
+
 from layers.network_layer import NetworkLayer
 from layers.data_link_layer import DataLinkLayer
 from layers.physical_layer import PhysicalLayer
-from models.events import Event, EventType
+from models.events import Event, EventType, TIMEOUT_SUPERSEDED
+
+log = logging.getLogger(__name__)
 
 
 class Machine:
     """Máquina coordinadora que maneja todas las capas de red."""
 
+    # Atributos fijos: sin __dict__ por instancia, acceso por slot
+    __slots__ = ('machine_id', 'network_layer', 'physical_layer', 'protocol', 'data_link_layer',
+                 '_handle_timeout', '_execute_response')
+
     def __init__(self, machine_id: str, protocol_class, error_rate: float = 0.1,
                  transmission_delay: float = 0.5):
         """Inicializa la máquina con todas sus capas."""
@@ -26,44 +34,56 @@ class Machine:
         # Crear DataLinkLayer con el protocolo
         self.data_link_layer = DataLinkLayer(machine_id, self.protocol)
 
+        # Métodos usados en cada TIMEOUT, resueltos una sola vez
+        self._handle_timeout = self.protocol.handle_timeout
+        self._execute_response = self.data_link_layer._execute_protocol_response
+
     def handle_event(self, event: Event, simulator) -> None:
         """Enruta eventos a la capa apropiada."""
-        print(f"[Machine-{self.machine_id}] Procesando evento: {event.event_type}")
-
-        if event.event_type == EventType.FRAME_ARRIVAL:
-            # Frame válido -> DataLinkLayer maneja
-            self.data_link_layer.handle_frame_arrival(event.data, simulator)
-
-
-        elif event.event_type == EventType.NETWORK_LAYER_READY:
-            # NetworkLayer tiene datos -> coordinar con DataLinkLayer
-            self.data_link_layer.handle_network_layer_ready(self.network_layer, simulator)
-
-
-        elif event.event_type == "DELIVER_PACKET":
-            # Entregar paquete a NetworkLayer
-            self.network_layer.deliver_packet(event.data)
-
-        elif event.event_type == "SEND_FRAME":
-            # Enviar frame a través de PhysicalLayer (directo, sin double delay)
-            frame_data = event.data
-            self.physical_layer.send_frame(frame_data['frame'], frame_data['destination'], simulator)
-
-        elif event.event_type == EventType.TIMEOUT:
-            # Timeout del protocolo -> delegar al protocolo via DataLinkLayer
-            # Verificar si el protocolo soporta timeouts específicos por frame
-            if hasattr(self.protocol, 'handle_timeout_for_frame') and event.data and 'timer_id' in event.data:
-                response = self.protocol.handle_timeout_for_frame(event.data['timer_id'], simulator)
-            else:
-                response = self.protocol.handle_timeout(simulator)
-            self.data_link_layer._execute_protocol_response(response, simulator)
+        log.debug("[Machine-%s] Procesando evento: %s", self.machine_id, event.event_type.name)
 
+        # Una búsqueda en la tabla en lugar de comparar contra cada tipo
+        handler = self._event_handlers.get(event.event_type)
+        if handler is not None:
+            handler(self, event, simulator)
         else:
-            print(f"[Machine-{self.machine_id}] Evento no reconocido: {event.event_type}")
+            log.warning("[Machine-%s] Evento no reconocido: %r", self.machine_id, event.event_type)
+
+    def _on_frame_arrival(self, event: Event, simulator) -> None:
+        # Frame válido -> DataLinkLayer maneja
+        self.data_link_layer.handle_frame_arrival(event.data, simulator)
+
+    def _on_network_layer_ready(self, event: Event, simulator) -> None:
+        # NetworkLayer tiene datos -> coordinar con DataLinkLayer
+        self.data_link_layer.handle_network_layer_ready(self.network_layer, simulator)
+
+    def _on_deliver_packet(self, event: Event, simulator) -> None:
+        # Entregar paquete(s) a NetworkLayer
+        self.network_layer.deliver_packets(event.data)
+
+    def _on_send_frame(self, event: Event, simulator) -> None:
+        # Enviar frame a través de PhysicalLayer (directo, sin double delay)
+        frame_data = event.data
+        self.physical_layer.send_frame(frame_data['frame'], frame_data['destination'], simulator)
+
+    def _on_timeout(self, event: Event, simulator) -> None:
+        # Timeout del protocolo -> delegar al protocolo via DataLinkLayer
+        if event.data is TIMEOUT_SUPERSEDED:
+            return  # El protocolo ya encoló otro TIMEOUT en su lugar
+        self._execute_response(self._handle_timeout(simulator), simulator)
+
+    # Tipo de evento -> método que lo procesa
+    _event_handlers = {
+        EventType.FRAME_ARRIVAL: _on_frame_arrival,
+        EventType.NETWORK_LAYER_READY: _on_network_layer_ready,
+        EventType.DELIVER_PACKET: _on_deliver_packet,
+        EventType.SEND_FRAME: _on_send_frame,
+        EventType.TIMEOUT: _on_timeout,
+    }
 
     def start(self, simulator) -> None:
         """Inicia la máquina."""
-        print(f"[Machine-{self.machine_id}] Iniciando máquina...")
+        log.info("[Machine-%s] Iniciando máquina...", self.machine_id)
 
         # Si NetworkLayer tiene datos iniciales, programar evento
         if self.network_layer.has_data_ready():
@@ -102,8 +122,8 @@ class Machine:
         """Obtiene estadísticas de la máquina."""
         return {
             'machine_id': self.machine_id,
-            'frames_sent': getattr(self.physical_layer, 'frames_sent', 0),
-            'frames_received': getattr(self.physical_layer, 'frames_received', 0),
+            'frames_sent': self.physical_layer.frames_sent,
+            'frames_received': self.physical_layer.frames_received,
             'error_rate': self.physical_layer.get_error_rate(),
             'transmission_delay': self.physical_layer.get_transmission_delay()
         }
@@ -1,7 +1,16 @@
+import logging
+import sys
+import threading
+
 from simulation.event_scheduler import EventScheduler
 from simulation.machine import Machine
 from models.events import Event, EventType
 
+log = logging.getLogger(__name__)
+
+# Segundos entre re-chequeos de _running mientras la simulación está en pausa
+_PAUSE_POLL_INTERVAL = 0.2
+
 
 class Simulator:
     def __init__(self):
@@ -10,22 +19,32 @@ class Simulator:
         self._current_time = 0.0  # Tiempo actual de simulación
         self._running = False  # Estado de ejecución
         self._paused = False  # Estado de pausa global
+        self._resume_event = threading.Event()  # Señalado mientras no está en pausa
+        self._resume_event.set()
 
 
-        print("[Simulator] Simulador inicializado")
+        log.info("[Simulator] Simulador inicializado")
 
     def add_machine(self, machine_id: str, protocol_class, error_rate: float = 0.1,
                    transmission_delay: float = 0.5) -> None:
         """Registra una nueva máquina con configuración individual."""
+        # Internado: los eventos llevan este mismo objeto y las búsquedas por
+        # id comparan por identidad aunque el id venga de entrada del usuario
+        machine_id = sys.intern(machine_id)
         machine = Machine(machine_id, protocol_class, error_rate, transmission_delay)
         self._machines[machine_id] = machine
-        print(f"[Simulator] Máquina {machine_id} agregada (error_rate={error_rate}, transmission_delay={transmission_delay}s)")
+        log.info("[Simulator] Máquina %s agregada (error_rate=%s, transmission_delay=%ss)", machine_id, error_rate, transmission_delay)
 
     def schedule_event(self, event: Event) -> None:
         """Programa un evento en la cola."""
         if not self._paused:
             self.event_scheduler.schedule_event(event)
 
+    def schedule_events(self, events) -> None:
+        """Programa un lote de eventos en la cola."""
+        if not self._paused:
+            self.event_scheduler.schedule_events(events)
+
     def get_current_time(self) -> float:
         """Retorna el tiempo actual de simulación."""
         return self._current_time
@@ -39,7 +58,7 @@ class Simulator:
                 self._machines[machine_id].set_error_rate(error_rate)
                 return True
             except Exception as e:
-                print(f"[Simulator] Error configurando tasa de errores para {machine_id}: {e}")
+                log.warning("[Simulator] Error configurando tasa de errores para %s: %s", machine_id, e)
                 return False
         return False
 
@@ -50,7 +69,7 @@ class Simulator:
                 self._machines[machine_id].set_transmission_delay(delay)
                 return True
             except Exception as e:
-                print(f"[Simulator] Error configurando retardo para {machine_id}: {e}")
+                log.warning("[Simulator] Error configurando retardo para %s: %s", machine_id, e)
                 return False
         return False
 
@@ -70,12 +89,14 @@ class Simulator:
     def pause_simulation(self) -> None:
         """Pausa toda la simulación."""
         self._paused = True
-        print("[Simulator] Simulación pausada")
+        self._resume_event.clear()
+        log.info("[Simulator] Simulación pausada")
 
     def resume_simulation(self) -> None:
         """Reanuda la simulación."""
         self._paused = False
-        print("[Simulator] Simulación reanudada")
+        self._resume_event.set()
+        log.info("[Simulator] Simulación reanudada")
 
     def pause_machine(self, machine_id: str) -> bool:
         """Pausa una máquina específica."""
@@ -91,15 +112,25 @@ class Simulator:
             return True
         return False
 
+    def cancel_machine_events(self, machine_id: str) -> bool:
+        """Cancela los eventos pendientes de una máquina y avisa a su protocolo."""
+        if machine_id in self._machines:
+            self.event_scheduler._cancel_events_for_machine(machine_id)
+            self._machines[machine_id].protocol.events_cancelled()
+            return True
+        return False
+
     def send_data(self, from_machine: str, to_machine: str, data: str) -> bool:
         """Envía datos específicos desde una máquina hacia otra."""
+        from_machine = sys.intern(from_machine)
+        to_machine = sys.intern(to_machine)
         if from_machine in self._machines and to_machine in self._machines:
             machine = self._machines[from_machine]
             machine.network_layer.add_data_to_send(data, to_machine)
 
             # Programa evento de envío
             event = Event(EventType.NETWORK_LAYER_READY,
-                         self.get_current_time() + 0.1,
+                         self._current_time + 0.1,
                          from_machine)
             self.schedule_event(event)
             return True
@@ -115,63 +146,83 @@ class Simulator:
         for machine in self._machines.values():
             machine.start(self)
 
+        if self._paused:
+            self._resume_event.clear()  # stop_simulation pudo señalarlo en pausa
         self._running = True
-        print("[Simulator] Simulador iniciado y listo para procesar eventos")
+        log.info("[Simulator] Simulador iniciado y listo para procesar eventos")
 
     def run_simulation(self) -> None:
         """Procesa todos los eventos pendientes en la cola."""
         if not self._running:
-            print("[Simulator] Simulación no iniciada. Llama start_simulation() primero.")
+            log.warning("[Simulator] Simulación no iniciada. Llama start_simulation() primero.")
             return
 
         event_count = 0
 
-        # Procesa todos los eventos pendientes
-        while self._running and self.event_scheduler.has_events():
+        # Métodos y tablas resueltos una vez fuera del lazo. Los sitios de
+        # llamada son monomórficos (siempre Machine, EventType y tuplas en el
+        # heap), lo que aprovecha la especialización de CPython 3.11+ y PyPy
+        get_next_event = self.event_scheduler.get_next_event
+        machines = self._machines
+
+        # Procesa todos los eventos pendientes: get_next_event devuelve None
+        # con la cola vacía, así basta una llamada por evento
+        while self._running:
             if self._paused:
-                print("[Simulator] Simulación pausada - esperando...")
+                if not self.event_scheduler.has_events():
+                    break
+                # Bloquea sin consumir CPU hasta resume_simulation o stop_simulation
+                # (otro hilo); el timeout permite re-chequear _running y Ctrl+C
+                log.debug("[Simulator] Simulación pausada - esperando...")
+                while self._paused and self._running:
+                    self._resume_event.wait(_PAUSE_POLL_INTERVAL)
                 continue
 
-            event = self.event_scheduler.get_next_event()
-            if not event:
+            event = get_next_event()
+            if event is None:
                 break
 
             self._current_time = event.timestamp  # Avanza el tiempo de simulación
             event_count += 1
 
-            print(f"\n--- Tiempo: {self._current_time:.2f}s | Evento #{event_count} ---")
+            log.debug("\n--- Tiempo: %.2fs | Evento #%s ---", self._current_time, event_count)
 
             # Entrega evento a la máquina correspondiente
-            if event.machine_id in self._machines:
-                machine = self._machines[event.machine_id]
+            machine = machines.get(event.machine_id)
+            if machine is not None:
                 machine.handle_event(event, self)
             else:
-                print(f"[ERROR] Máquina {event.machine_id} no encontrada")
+                log.error("[ERROR] Máquina %s no encontrada", event.machine_id)
 
         if event_count > 0:
-            print(f"[Simulator] Procesados {event_count} eventos")
+            log.debug("[Simulator] Procesados %s eventos", event_count)
 
     def stop_simulation(self) -> None:
         """Detiene la simulación."""
         self._running = False
-        print("[Simulator] Simulación detenida por usuario")
+        self._resume_event.set()  # Despierta un run_simulation en pausa
+        log.info("[Simulator] Simulación detenida por usuario")
 
     def _print_final_stats(self, event_count: int) -> None:
-        # Imprime estadísticas finales de la simulación
-        print(f"\n{'='*50}")
-        print(f"SIMULACIÓN TERMINADA")
-        print(f"{'='*50}")
-        print(f"Tiempo total: {self._current_time:.2f}s")
-        print(f"Eventos procesados: {event_count}")
+        # Imprime estadísticas finales de la simulación (armadas en una lista
+        # y emitidas con una sola escritura)
+        lines = [
+            f"\n{'='*50}",
+            "SIMULACIÓN TERMINADA",
+            f"{'='*50}",
+            f"Tiempo total: {self._current_time:.2f}s",
+            f"Eventos procesados: {event_count}",
+        ]
 
         # Muestra estadísticas de cada máquina
         for machine_id, machine in self._machines.items():
-            print(f"\n--- Estadísticas Máquina {machine_id} ---")
+            lines.append(f"\n--- Estadísticas Máquina {machine_id} ---")
             stats = machine.get_stats()
             for key, value in stats.items():
                 if isinstance(value, dict):
-                    print(f"  {key}:")
-                    for k, v in value.items():
-                        print(f"    {k}: {v}")
+                    lines.append(f"  {key}:")
+                    lines.extend(f"    {k}: {v}" for k, v in value.items())
                 else:
-                    print(f"  {key}: {value}")
\ No newline at end of file
+                    lines.append(f"  {key}: {value}")
+
+        print("\n".join(lines))
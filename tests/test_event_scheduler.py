@@ -0,0 +1,81 @@
+"""
+EventScheduler: orden FIFO en empates y cancelación perezosa con eventos reutilizados.
+"""
+
+from models.events import Event, EventType
+from protocols.par import PARProtocol
+from simulation.event_scheduler import EventScheduler
+from simulation.simulator import Simulator
+
+
+def test_cancel_discards_stale_entry_of_reused_event():
+    # Un protocolo re-encola su mismo Event TIMEOUT: la entrada vieja del heap
+    # debe descartarse aunque el mismo objeto vuelva a estar en la cola
+    scheduler = EventScheduler()
+    timeout_event = Event(EventType.TIMEOUT, 1.0, "A")
+    scheduler.schedule_event(timeout_event)
+    scheduler._cancel_events_for_machine("A")
+
+    timeout_event.timestamp = 2.0
+    scheduler.schedule_event(timeout_event)
+
+    first = scheduler.get_next_event()
+    assert first is timeout_event and first.timestamp == 2.0
+    assert scheduler.get_next_event() is None
+    assert scheduler.discarded_events == 1
+
+
+def test_cancel_only_affects_that_machine():
+    scheduler = EventScheduler()
+    scheduler.schedule_event(Event(EventType.SEND_FRAME, 1.0, "A"))
+    kept = Event(EventType.SEND_FRAME, 1.5, "B")
+    scheduler.schedule_event(kept)
+    scheduler._cancel_events_for_machine("A")
+
+    assert scheduler.get_next_event() is kept
+    assert not scheduler.has_events()
+
+
+def test_cancel_machine_events_lets_protocol_rearm_its_timer():
+    # Sin el aviso events_cancelled, timeout_event_scheduled queda en True y
+    # el protocolo no vuelve a encolar su TIMEOUT tras la cancelación
+    sim = Simulator()
+    sim.add_machine("A", PARProtocol, error_rate=0.0, transmission_delay=1.0)
+    protocol = sim._machines["A"].protocol
+
+    protocol._schedule_timeout(sim)
+    assert sim.cancel_machine_events("A")
+    assert not sim.event_scheduler.has_events()
+
+    protocol._schedule_timeout(sim)
+    assert sim.event_scheduler.peek_next_event() is protocol._timeout_event
+
+
+def _drain(scheduler: EventScheduler) -> list:
+    popped = []
+    while scheduler.has_events():
+        popped.append(scheduler.get_next_event())
+    return popped
+
+
+def test_equal_timestamps_pop_in_insertion_order():
+    scheduler = EventScheduler()
+    events = [Event(EventType.SEND_FRAME, 1.0, "A", k) for k in range(6)]
+    scheduler.schedule_event(Event(EventType.SEND_FRAME, 2.0, "A"))
+    for event in events:
+        scheduler.schedule_event(event)
+
+    assert _drain(scheduler)[:6] == events
+
+
+def test_batch_scheduling_keeps_insertion_order_on_ties():
+    # Lote mayor que la cola (extend + heapify) y lote menor (heappush)
+    for queued in (1, 10):
+        scheduler = EventScheduler()
+        earlier = [Event(EventType.SEND_FRAME, 1.0, "A", ("cola", k)) for k in range(queued)]
+        for event in earlier:
+            scheduler.schedule_event(event)
+        batch = [Event(EventType.SEND_FRAME, 1.0, "B", ("lote", k)) for k in range(5)]
+        scheduler.schedule_events(batch)
+
+        assert _drain(scheduler) == earlier + batch
@@ -0,0 +1,50 @@
+"""
+Go-Back-N: un ACK que avanza la base reinicia el timer global.
+"""
+
+from models.events import EventType
+from models.frame import Frame, FrameType
+from protocols.go_back_n import GoBackNProtocol
+from simulation.simulator import Simulator
+
+
+def _fire_next_timeout(sim: Simulator):
+    # Despacha solo eventos TIMEOUT (el resto del tráfico no interesa aquí)
+    while True:
+        event = sim.event_scheduler.get_next_event()
+        assert event is not None, "no quedó ningún TIMEOUT en la cola"
+        if event.event_type == EventType.TIMEOUT:
+            # Se lee antes de despachar: el re-armado reutiliza el mismo Event
+            fired_at = sim._current_time = event.timestamp
+            sim._machines["A"].handle_event(event, sim)
+            return fired_at
+
+
+def test_ack_of_base_restarts_timeout():
+    sim = Simulator()
+    sim.add_machine("A", GoBackNProtocol, error_rate=0.0, transmission_delay=1.0)
+    sim.add_machine("B", GoBackNProtocol, error_rate=0.0, transmission_delay=1.0)
+    machine = sim._machines["A"]
+    protocol = machine.protocol
+
+    # Ventana de 3 frames enviada en t=0: vencimiento original en t=4
+    for letter in "XYZ":
+        machine.network_layer.add_data_to_send(letter, "B")
+        protocol.handle_network_layer_ready(machine.network_layer, machine.data_link_layer, sim)
+    original_deadline = protocol.timer_deadline
+    assert original_deadline == protocol.timeout_duration
+
+    # En t=1 llega el ACK de la base: el timer se reinicia a t=5
+    sim._current_time = 1.0
+    machine.data_link_layer.handle_frame_arrival(Frame(FrameType.ACK, 0, 0), sim)
+    restarted_deadline = 1.0 + protocol.timeout_duration
+    assert protocol.send_base == 1
+    assert protocol.timer_deadline == restarted_deadline
+
+    # El evento encolado para el vencimiento original se re-arma sin reenviar
+    assert _fire_next_timeout(sim) == original_deadline
+    assert protocol.retransmissions == 0
+
+    # El reenvío ocurre en el vencimiento reiniciado, con los 2 frames pendientes
+    assert _fire_next_timeout(sim) == restarted_deadline
+    assert protocol.retransmissions == 2
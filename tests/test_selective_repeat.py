@@ -0,0 +1,104 @@
+"""
+Regresión Selective Repeat: ráfagas sobre un enlace con pérdidas.
+
+Con ACKs fuera de orden la ventana no debe llenarse más allá de
+send_base + N; si lo hace, el receptor toma esos frames como ya recibidos
+y los descarta.
+"""
+
+import random
+
+import pytest
+
+from models.events import TIMEOUT_SUPERSEDED
+from protocols.selective_repeat import SelectiveRepeatProtocol
+from simulation.simulator import Simulator
+
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+def _run_bursts(error_rate: float, burst: int, seed: int, total: int = 60) -> tuple:
+    # Envía `total` letras A -> B en ráfagas de `burst` y procesa tras cada ráfaga
+    random.seed(seed)
+    sim = Simulator()
+    sim.add_machine("A", SelectiveRepeatProtocol, error_rate=error_rate, transmission_delay=2.0)
+    sim.add_machine("B", SelectiveRepeatProtocol, error_rate=error_rate, transmission_delay=1.5)
+    sim.start_simulation()
+
+    sent = [ALPHABET[i % len(ALPHABET)] for i in range(total)]
+    for start in range(0, total, burst):
+        for letter in sent[start:start + burst]:
+            sim.send_data("A", "B", letter)
+        sim.run_simulation()
+    sim.stop_simulation()
+
+    received = [packet.data for packet in sim._machines["B"].network_layer.received_packets]
+    return sent, received
+
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("burst", (8, 13, 20))
+@pytest.mark.parametrize("error_rate", (0.1, 0.3))
+def test_bursts_over_lossy_link_deliver_everything_in_order(error_rate, burst, seed):
+    sent, received = _run_bursts(error_rate, burst, seed)
+    assert received == sent
+
+
+def test_send_window_bounded_by_send_base():
+    # Con N=4 y espacio 2N, next_seq_num nunca se aleja más de N de send_base
+    random.seed(0)
+    sim = Simulator()
+    sim.add_machine("A", SelectiveRepeatProtocol, error_rate=0.3, transmission_delay=2.0)
+    sim.add_machine("B", SelectiveRepeatProtocol, error_rate=0.3, transmission_delay=1.5)
+    sim.start_simulation()
+
+    protocol = sim._machines["A"].protocol
+    original = protocol.handle_network_layer_ready
+    distances = []
+
+    def spy(*args):
+        response = original(*args)
+        distances.append((protocol.next_seq_num - protocol.send_base) % protocol.max_seq_num)
+        return response
+
+    # __slots__ impide reemplazar el método en la instancia: se intercepta en DataLinkLayer
+    sim._machines["A"].data_link_layer._on_network_layer_ready = spy
+
+    for start in range(0, 60, 20):
+        for i in range(start, start + 20):
+            sim.send_data("A", "B", ALPHABET[i % len(ALPHABET)])
+        sim.run_simulation()
+    sim.stop_simulation()
+
+    assert distances and max(distances) <= protocol.window_size
+
+
+def test_shorter_rto_moves_queued_timeout_earlier():
+    # Si el RTO se acorta, un frame nuevo vence antes que el TIMEOUT ya
+    # encolado: el timer debe adelantarse y el evento viejo quedar inerte
+    sim = Simulator()
+    sim.add_machine("A", SelectiveRepeatProtocol, error_rate=0.0, transmission_delay=1.0)
+    sim.add_machine("B", SelectiveRepeatProtocol, error_rate=0.0, transmission_delay=1.0)
+    machine = sim._machines["A"]
+    protocol = machine.protocol
+    network_layer = machine.network_layer
+    scheduler = sim.event_scheduler
+
+    network_layer.add_data_to_send("x", "B")
+    protocol.handle_network_layer_ready(network_layer, machine.data_link_layer, sim)
+    first_event = protocol._timeout_event
+    assert first_event.timestamp == protocol.timeout_duration
+
+    protocol.timeout_duration = 1.0
+    sim._current_time = 0.5
+    network_layer.add_data_to_send("y", "B")
+    protocol.handle_network_layer_ready(network_layer, machine.data_link_layer, sim)
+
+    fired = scheduler.get_next_event()
+    assert fired is protocol._timeout_event and fired.timestamp == 1.5
+
+    stale = scheduler.get_next_event()
+    assert stale is first_event and stale.data is TIMEOUT_SUPERSEDED
+    sim._current_time = stale.timestamp
+    machine.handle_event(stale, sim)
+    assert protocol.retransmissions == 0 and not scheduler.has_events()
@@ -0,0 +1,43 @@
+"""
+Pausa y detención de Simulator.run_simulation desde otro hilo.
+"""
+
+import threading
+
+from protocols.par import PARProtocol
+from simulation.simulator import Simulator
+
+
+def _paused_simulator() -> Simulator:
+    sim = Simulator()
+    sim.add_machine("A", PARProtocol, error_rate=0.0, transmission_delay=0.5)
+    sim.add_machine("B", PARProtocol, error_rate=0.0, transmission_delay=0.5)
+    sim.start_simulation()
+    sim.send_data("A", "B", "x")
+    sim.pause_simulation()
+    return sim
+
+
+def _run_in_thread(sim: Simulator) -> threading.Thread:
+    runner = threading.Thread(target=sim.run_simulation, daemon=True)
+    runner.start()
+    return runner
+
+
+def test_stop_while_paused_ends_run():
+    sim = _paused_simulator()
+    runner = _run_in_thread(sim)
+
+    sim.stop_simulation()
+    runner.join(timeout=5)
+    assert not runner.is_alive()
+
+
+def test_resume_while_paused_processes_pending_events():
+    sim = _paused_simulator()
+    runner = _run_in_thread(sim)
+
+    sim.resume_simulation()
+    runner.join(timeout=5)
+    assert not runner.is_alive()
+    assert [p.data for p in sim._machines["B"].network_layer.received_packets] == ["x"]